@@ -0,0 +1,115 @@
+"""
+Admission control for CPU-bound endpoints
+
+Each heavy endpoint gets a limiter with a fixed number of execution slots
+and a bounded wait queue. Requests beyond the queue are rejected at once,
+and queued requests give up after a maximum wait, so under overload the
+admitted requests keep a bounded latency instead of every client slowing
+down together.
+"""
+
+import asyncio
+import contextlib
+import time
+from typing import Dict
+
+
+class AdmissaoRecusada(Exception):
+    """Raised when a request is not admitted; mapped to an HTTP error with Retry-After."""
+
+    def __init__(self, mensagem: str, status_code: int, retry_after: int):
+        super().__init__(mensagem)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class AdmissionLimiter:
+    """
+    Concurrency limit plus bounded FIFO queue for one endpoint.
+
+    - A free slot: the request runs immediately.
+    - No free slot, room in the queue: it waits up to ``espera_max_s``
+      seconds, then is rejected with 503.
+    - Queue full: it is rejected immediately with 429.
+    """
+
+    def __init__(self, nome: str, concorrencia: int, tamanho_fila: int,
+                 espera_max_s: float, retry_after: int = 1):
+        """
+        Args:
+            nome: Name used in messages and metrics
+            concorrencia: Requests executed at the same time
+            tamanho_fila: Requests allowed to wait for a slot
+            espera_max_s: Maximum time a request waits in the queue
+            retry_after: Value of the Retry-After header on rejection (seconds)
+        """
+        self.nome = nome
+        self.concorrencia = concorrencia
+        self.tamanho_fila = tamanho_fila
+        self.espera_max_s = espera_max_s
+        self.retry_after = retry_after
+
+        self._semaforo = asyncio.Semaphore(concorrencia)
+        self.em_execucao = 0
+        self.na_fila = 0
+        self.pico_fila = 0
+        self.admitidas = 0
+        self.rejeitadas_fila_cheia = 0
+        self.rejeitadas_espera = 0
+        self._espera_total_s = 0.0
+
+    @contextlib.asynccontextmanager
+    async def admit(self):
+        """
+        Hold an execution slot for the duration of the ``async with`` block.
+
+        Raises:
+            AdmissaoRecusada: If the queue is full or the wait times out
+        """
+        if not self._semaforo.locked():
+            # Free slot: taken without queueing or waiting
+            await self._semaforo.acquire()
+        else:
+            if self.na_fila >= self.tamanho_fila:
+                self.rejeitadas_fila_cheia += 1
+                raise AdmissaoRecusada(
+                    f"Too many '{self.nome}' requests queued", 429, self.retry_after
+                )
+
+            inicio = time.monotonic()
+            self.na_fila += 1
+            self.pico_fila = max(self.pico_fila, self.na_fila)
+            try:
+                await asyncio.wait_for(self._semaforo.acquire(), self.espera_max_s)
+            except asyncio.TimeoutError:
+                self.rejeitadas_espera += 1
+                raise AdmissaoRecusada(
+                    f"'{self.nome}' is overloaded, no slot within {self.espera_max_s:g} s",
+                    503, self.retry_after
+                )
+            finally:
+                self.na_fila -= 1
+
+            self._espera_total_s += time.monotonic() - inicio
+
+        self.admitidas += 1
+        self.em_execucao += 1
+        try:
+            yield
+        finally:
+            self.em_execucao -= 1
+            self._semaforo.release()
+
+    def metrics(self) -> Dict:
+        """Current load and counters since startup."""
+        return {
+            'concorrencia': self.concorrencia,
+            'tamanho_fila': self.tamanho_fila,
+            'em_execucao': self.em_execucao,
+            'na_fila': self.na_fila,
+            'pico_fila': self.pico_fila,
+            'admitidas': self.admitidas,
+            'rejeitadas_fila_cheia': self.rejeitadas_fila_cheia,
+            'rejeitadas_espera': self.rejeitadas_espera,
+            'espera_media_ms': self._espera_total_s / self.admitidas * 1000 if self.admitidas else 0.0
+        }
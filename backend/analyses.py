@@ -0,0 +1,186 @@
+"""
+Heavy analyses executed as background jobs
+
+Each analysis receives the fuzzy engine, its validated parameters and a
+progress callback ``progresso(fracao)`` (0-1). The callback raises when the
+job has been cancelled, so analyses only need to call it regularly.
+"""
+
+import itertools
+import numpy as np
+from math import comb
+from typing import Callable, Dict
+
+from fuzzy_engine import FuzzyMegaSenaEngine
+
+
+ProgressCallback = Callable[[float], None]
+
+
+def run_sweep(engine: FuzzyMegaSenaEngine, parametros: Dict,
+              progresso: ProgressCallback) -> Dict:
+    """
+    Sweep each selected variable weight from 0 to 100 keeping the others fixed.
+
+    Parameters:
+        pesos: Base weights
+        variaveis: Variables to sweep
+        passos: Number of points per variable
+        quantidade_principal: Number of main recommendations per point
+    """
+    pesos_base = parametros['pesos']
+    variaveis = parametros['variaveis']
+    valores = np.linspace(0, 100, parametros['passos'])
+    top_n = parametros['quantidade_principal']
+
+    total = len(variaveis) * len(valores)
+    feitos = 0
+    varreduras = {}
+
+    for variavel in variaveis:
+        pontos = []
+        for valor in valores:
+            pesos = dict(pesos_base, **{variavel: float(valor)})
+            resultados = engine.calculate_all_scores(pesos)
+            top = resultados.head(top_n)
+
+            pontos.append({
+                'peso': float(valor),
+                'numeros_principais': [int(x) for x in top['numero']],
+                'media_score_principais': float(top['score'].mean()),
+                'media_score': float(resultados['score'].mean())
+            })
+
+            feitos += 1
+            progresso(feitos / total)
+
+        varreduras[variavel] = pontos
+
+    return {'varreduras': varreduras}
+
+
+def run_backtest(engine: FuzzyMegaSenaEngine, parametros: Dict,
+                 progresso: ProgressCallback) -> Dict:
+    """
+    Walk-forward backtest over the most recent contests.
+
+    For each tested contest the fuzzy variables are rebuilt from the draws
+    before it, the top numbers are picked with the given weights and the
+    hits against the actual draw are counted.
+
+    Parameters:
+        pesos: Weights for each variable
+        quantidade_principal: Number of picked numbers per contest
+        concursos: Number of most recent contests to test
+    """
+    pesos = parametros['pesos']
+    top_n = parametros['quantidade_principal']
+
+    testados = engine.draws.recent(parametros['concursos'])
+
+    detalhes = []
+    # Most recent contest first
+    for i, (concurso, numeros) in enumerate(
+            zip(testados.concursos[::-1], testados.numeros[::-1]), 1):
+        concurso = int(concurso)
+        sorteados = {int(n) for n in numeros}
+
+        dados_fuzzy = engine.fuzzy_variables_before(concurso)
+        resultados = engine.calculate_all_scores(pesos, dados_fuzzy)
+        escolhidos = [int(x) for x in resultados.head(top_n)['numero']]
+
+        detalhes.append({
+            'concurso': concurso,
+            'numeros_principais': escolhidos,
+            'acertos': len(sorteados.intersection(escolhidos))
+        })
+
+        progresso(i / len(testados))
+
+    acertos = np.array([d['acertos'] for d in detalhes])
+
+    return {
+        'concursos_testados': len(detalhes),
+        'media_acertos': float(acertos.mean()) if len(acertos) else 0.0,
+        # Expected hits when picking top_n numbers at random
+        'media_acertos_aleatorio': top_n * 6 / 60,
+        'distribuicao_acertos': {
+            str(k): int((acertos == k).sum()) for k in range(0, min(top_n, 6) + 1)
+        },
+        'detalhes': detalhes
+    }
+
+
+def run_ticket_enumeration(engine: FuzzyMegaSenaEngine, parametros: Dict,
+                           progresso: ProgressCallback) -> Dict:
+    """
+    Enumerate every ticket that can be formed from the extended pool.
+
+    Tickets are ranked by the sum of the fuzzy scores of their numbers and
+    only the best ``top_k`` are kept.
+
+    Parameters:
+        pesos: Weights for each variable
+        quantidade_pool: Size of the pool to enumerate from
+        tamanho_bilhete: Numbers per ticket
+        top_k: Number of tickets to return
+    """
+    resultados = engine.calculate_all_scores(parametros['pesos'])
+    pool = resultados.head(parametros['quantidade_pool'])
+    numeros = pool['numero'].to_numpy(dtype=np.int64)
+    scores = pool['score'].to_numpy(dtype=np.float64)
+
+    tamanho = parametros['tamanho_bilhete']
+    top_k = parametros['top_k']
+    total = comb(len(numeros), tamanho)
+    tamanho_lote = 100_000
+
+    melhores_idx = np.empty((0, tamanho), dtype=np.int64)
+    melhores_score = np.empty(0, dtype=np.float64)
+
+    combinacoes = itertools.combinations(range(len(numeros)), tamanho)
+    processados = 0
+
+    while True:
+        lote = np.fromiter(
+            itertools.chain.from_iterable(itertools.islice(combinacoes, tamanho_lote)),
+            dtype=np.int64
+        ).reshape(-1, tamanho)
+        if len(lote) == 0:
+            break
+
+        # Keep only the running top_k across batches
+        candidatos_idx = np.vstack([melhores_idx, lote])
+        candidatos_score = np.concatenate([melhores_score, scores[lote].sum(axis=1)])
+        if len(candidatos_score) > top_k:
+            manter = np.argpartition(-candidatos_score, top_k - 1)[:top_k]
+            candidatos_idx = candidatos_idx[manter]
+            candidatos_score = candidatos_score[manter]
+        melhores_idx, melhores_score = candidatos_idx, candidatos_score
+
+        processados += len(lote)
+        progresso(processados / total)
+
+    ordem = np.argsort(-melhores_score, kind='stable')
+    bilhetes = []
+    for k in ordem:
+        bilhete = sorted(int(x) for x in numeros[melhores_idx[k]])
+        bilhetes.append({
+            'numeros': bilhete,
+            'score_total': float(melhores_score[k]),
+            'soma': sum(bilhete),
+            'pares': sum(1 for n in bilhete if n % 2 == 0)
+        })
+
+    return {
+        'pool': [int(x) for x in numeros],
+        'total_bilhetes': total,
+        'bilhetes': bilhetes
+    }
+
+
+ANALYSES: Dict[str, Callable[[FuzzyMegaSenaEngine, Dict, ProgressCallback], Dict]] = {
+    'varredura': run_sweep,
+    'backtest': run_backtest,
+    'enumeracao': run_ticket_enumeration,
+}
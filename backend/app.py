@@ -2,10 +2,16 @@
 FastAPI application for Fuzzy Mega-Sena System
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+import asyncio
+import json
 import logging
+from typing import Optional, Tuple
+
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
 
 from config import settings
 from models import (
@@ -15,9 +21,24 @@ from models import (
     ConfiguracaoPadrao,
     DadosHistoricos,
     HealthResponse,
-    PesosInput
+    PesosInput,
+    CoocorrenciaResponse,
+    JobRequest,
+    JobResponse,
+    JobResultadoResponse,
+    VarreduraParametros,
+    BacktestParametros,
+    EnumeracaoParametros,
+    SuperficieResponse,
+    ReadinessResponse,
+    AdmissaoMetricasResponse
 )
 from fuzzy_engine import FuzzyMegaSenaEngine
+from jobs import JobManager, CONCLUIDO
+from readiness import Readiness, ERRO
+from admission import AdmissionLimiter, AdmissaoRecusada
+from pool_optimizer import ErroOtimizacao, RestricoesInviaveis
+from realtime import CalculoSession
 
 # Configure logging
 logging.basicConfig(
@@ -47,18 +68,125 @@ app.add_middleware(
 # Initialize fuzzy engine (singleton)
 fuzzy_engine: FuzzyMegaSenaEngine = None
 
+# Background job manager (singleton)
+job_manager: JobManager = None
+
+# Background initialization status
+readiness = Readiness()
+
+# Admission control for score calculations (HTTP and WebSocket)
+limitador_calculo = AdmissionLimiter(
+    'calcular',
+    concorrencia=settings.CALC_MAX_CONCURRENCY,
+    tamanho_fila=settings.CALC_MAX_QUEUE,
+    espera_max_s=settings.CALC_MAX_WAIT,
+    retry_after=settings.CALC_RETRY_AFTER
+)
+
+# Result for the default request, keyed by dataset version
+_resultado_padrao: Optional[Tuple[str, ResultadosData]] = None
+
+# Parameter model for each background job type
+JOB_PARAMETROS = {
+    'varredura': VarreduraParametros,
+    'backtest': BacktestParametros,
+    'enumeracao': EnumeracaoParametros,
+}
+
+
+def _init_engine():
+    global fuzzy_engine
+    logger.info("Initializing Fuzzy Mega-Sena Engine...")
+    fuzzy_engine = FuzzyMegaSenaEngine(
+        data_path=settings.DATA_PATH,
+        incluir_triplets=settings.COOCCURRENCE_TRIPLETS
+    )
+    logger.info("Fuzzy engine initialized successfully")
+
+
+def _init_jobs():
+    global job_manager
+    job_manager = JobManager(
+        db_path=settings.JOBS_DB_PATH,
+        data_path=settings.DATA_PATH,
+        max_workers=settings.JOBS_MAX_WORKERS,
+        max_ativos=settings.JOBS_MAX_QUEUE,
+        retry_after=settings.JOBS_RETRY_AFTER
+    )
+    logger.info("Job manager initialized successfully")
+
+
+def _warm_null_distributions():
+    fuzzy_engine.build_null_distributions(
+        amostras=settings.NULL_DISTRIBUTION_SAMPLES,
+        seed=settings.NULL_DISTRIBUTION_SEED,
+        workers=settings.NULL_DISTRIBUTION_WORKERS
+    )
+
+
+def _warm_score_surface():
+    fuzzy_engine.build_score_surface(
+        pontos_grade=settings.SCORE_SURFACE_GRID_POINTS,
+        orcamento_erro=settings.SCORE_SURFACE_MAX_ERROR,
+        amostras_validacao=settings.SCORE_SURFACE_VALIDATION_SAMPLES
+    )
+
+
+def _warm_default_result():
+    _default_result(CalcularRequest())
+
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize the fuzzy engine on startup."""
-    global fuzzy_engine
-    try:
-        logger.info("Initializing Fuzzy Mega-Sena Engine...")
-        fuzzy_engine = FuzzyMegaSenaEngine(data_path=settings.DATA_PATH)
-        logger.info("Fuzzy engine initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize fuzzy engine: {e}")
-        raise
+    """
+    Start initializing the fuzzy engine and warming caches in the background.
+
+    The server answers `/api/health` right away; `/api/ready` turns 200 once
+    every step has finished. Only the engine is required: the other steps
+    are optional, and if one fails its feature is reported as unavailable
+    while the rest of the API keeps working.
+    """
+    etapas = [
+        ('engine', _init_engine),
+        ('jobs', _init_jobs),
+        ('distribuicoes_nulas', _warm_null_distributions),
+    ]
+    if settings.SCORE_SURFACE_ENABLED:
+        etapas.append(('superficie', _warm_score_surface))
+    etapas.append(('resultado_padrao', _warm_default_result))
+
+    readiness.start(etapas, opcionais=[nome for nome, _ in etapas if nome != 'engine'])
+
+
+async def wait_until_ready():
+    """Dependency: wait (bounded) for the startup steps, else answer 503."""
+    if await readiness.wait(settings.STARTUP_WAIT_TIMEOUT):
+        return
+
+    estado = readiness.summary()
+    detalhe = (
+        f"Service failed to start: {estado['erro']}" if estado['status'] == ERRO
+        else f"Service is starting (step: {estado['etapa']})"
+    )
+    raise HTTPException(
+        status_code=503,
+        detail=detalhe,
+        headers={'Retry-After': str(settings.STARTUP_RETRY_AFTER)}
+    )
+
+
+async def require_jobs():
+    """Dependency: answer 503 when the job manager failed to start."""
+    if job_manager is None:
+        erro = readiness.indisponiveis.get('jobs', 'not initialized')
+        raise HTTPException(status_code=503, detail=f"Background jobs are unavailable: {erro}")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the background job workers."""
+    if job_manager is not None:
+        job_manager.shutdown()
 
 
 @app.get("/", tags=["Root"])
@@ -68,16 +196,18 @@ async def root():
         "message": "Sistema Fuzzy Mega-Sena API",
         "version": settings.API_VERSION,
         "docs": "/docs",
-        "health": "/api/health"
+        "health": "/api/health",
+        "ready": "/api/ready"
     }
 
 
 @app.get("/api/health", response_model=HealthResponse, tags=["Health"])
 async def health_check():
     """
-    Health check endpoint.
+    Liveness check endpoint.
 
-    Returns the current status and version of the API.
+    Returns "ok" as soon as the process answers, even while the engine is
+    still starting. Use `/api/ready` to know whether requests can be served.
     """
     return HealthResponse(
         status="ok",
@@ -85,7 +215,67 @@ async def health_check():
     )
 
 
-@app.post("/api/calcular", response_model=CalcularResponse, tags=["Fuzzy"])
+@app.get("/api/ready", response_model=ReadinessResponse, tags=["Health"],
+         responses={503: {"model": ReadinessResponse, "description": "Starting or failed"}})
+async def readiness_check():
+    """
+    Readiness check endpoint.
+
+    Returns 200 once the engine is built and the warm-up steps (jobs, null
+    distributions, score surface if enabled, default result) have run.
+    Optional steps that failed are listed in `indisponiveis`; their features
+    are unavailable but the service is ready. Returns 503 with `Retry-After`
+    while starting, or if the engine failed to build.
+    """
+    estado = ReadinessResponse(**readiness.summary())
+    if readiness.pronto:
+        return estado
+
+    return JSONResponse(
+        status_code=503,
+        content=estado.model_dump(),
+        headers={'Retry-After': str(settings.STARTUP_RETRY_AFTER)}
+    )
+
+
+def _recommendations(request: CalcularRequest) -> ResultadosData:
+    """Run the fuzzy engine for a calculation request."""
+    dados_fuzzy = None
+    if request.usa_intervalo:
+        dados_fuzzy = fuzzy_engine.range_fuzzy_variables(
+            concurso_inicio=request.concurso_inicio,
+            concurso_fim=request.concurso_fim,
+            data_inicio=request.data_inicio,
+            data_fim=request.data_fim,
+            janela_paridade=request.janela_paridade,
+            janela_soma=request.janela_soma
+        )
+
+    resultados = fuzzy_engine.get_recommendations(
+        pesos=request.pesos.model_dump(),
+        top_n=request.quantidade_principal,
+        pool_n=request.quantidade_pool,
+        peso_coocorrencia=request.peso_coocorrencia,
+        modo_inferencia=request.modo_inferencia,
+        meia_vida=request.meia_vida,
+        incluir_explicacao=request.incluir_explicacao,
+        dados_fuzzy=dados_fuzzy,
+        restricoes=request.restricoes.model_dump() if request.restricoes is not None else None
+    )
+    return ResultadosData(**resultados)
+
+
+def _default_result(request: CalcularRequest) -> ResultadosData:
+    """Result of the default request, computed once per dataset version."""
+    global _resultado_padrao
+    versao = fuzzy_engine.versao_dados
+    if _resultado_padrao is None or _resultado_padrao[0] != versao:
+        _resultado_padrao = (versao, _recommendations(request))
+    return _resultado_padrao[1]
+
+
+@app.post("/api/calcular", response_model=CalcularResponse, tags=["Fuzzy"],
+          dependencies=[Depends(wait_until_ready)])
 async def calcular_numeros(request: CalcularRequest):
     """
     Calculate fuzzy scores for all numbers based on provided weights.
@@ -98,12 +288,34 @@ async def calcular_numeros(request: CalcularRequest):
     - **pesos**: Weights for each of the 5 fuzzy variables (0-100%)
     - **quantidade_principal**: Number of main recommendations (default: 6)
     - **quantidade_pool**: Size of extended pool (default: 12)
+    - **peso_coocorrencia**: Rerank the extended pool by pair co-occurrence
+      (-1 diversifies, 1 favours affinity, default: 0 = plain score order)
+    - **modo_inferencia**: `auto` (default) interpolates from the precomputed
+      score surface when it is enabled and validated, `exata` always runs inference
+    - **meia_vida**: Optional half-life in draws; frequency and positional
+      distribution then weigh recent draws more (`0.5 ** (age / meia_vida)`)
+    - **incluir_explicacao**: Add `dados_graficos.explicacao` with the
+      membership degree of every number in each input term and the firing
+      strength of each of the 12 rules, taken from the same inference pass
+    - **concurso_inicio / concurso_fim / data_inicio / data_fim**: Optional
+      inclusive bounds; the fuzzy variables are then computed from those draws only
+    - **janela_paridade / janela_soma**: Last draws of the range behind the
+      even/odd balance and the sum tendency (default: 20 and 50)
+    - **restricoes**: Optional even/odd (`pares_min`/`pares_max`), tens bucket
+      (`dezenas_min`/`dezenas_max`, keyed `1-10` ... `51-60`) and sum
+      (`soma_min`/`soma_max`) constraints; the main numbers are then the set
+      with the highest total score that meets them. Infeasible constraints
+      return `success: false` with an error; a solver time-out or failure
+      returns 503
 
     **Returns:**
     - **numeros_principais**: Top recommended numbers with scores
     - **pool_estendido**: Extended pool of numbers
-    - **estatisticas**: Statistical analysis of results
+    - **estatisticas**: Statistical analysis of results, with `percentis` of the
+      main numbers against uniformly random sets of the same size
     - **dados_graficos**: Data for charts and visualizations
+    - **modo_inferencia**: Whether the surface (`superficie`) or exact inference was used
+    - **modo_selecao**: `top` (plain top scores) or `otimizada` (constrained selection)
 
     **Example Request:**
     ```json
@@ -123,26 +335,32 @@ async def calcular_numeros(request: CalcularRequest):
     try:
         logger.info(f"Calculating scores with weights: {request.pesos.model_dump()}")
 
-        # Convert Pydantic model to dict
-        pesos_dict = request.pesos.model_dump()
-
-        # Get recommendations from fuzzy engine
-        resultados = fuzzy_engine.get_recommendations(
-            pesos=pesos_dict,
-            top_n=request.quantidade_principal,
-            pool_n=request.quantidade_pool
-        )
-
-        # Build response
-        response_data = ResultadosData(**resultados)
+        # The default request (first page load) is answered from the warm-up result;
+        # anything else runs in the threadpool once admitted
+        if request == CalcularRequest():
+            response_data = _default_result(request)
+        else:
+            async with limitador_calculo.admit():
+                response_data = await run_in_threadpool(_recommendations, request)
 
-        logger.info(f"Calculation successful. Top number: {resultados['numeros_principais'][0]['numero']}")
+        logger.info(f"Calculation successful. Top number: {response_data.numeros_principais[0].numero}")
 
         return CalcularResponse(
             success=True,
             data=response_data
         )
 
+    except AdmissaoRecusada:
+        raise
+    except RestricoesInviaveis as e:
+        logger.warning(f"Selection constraints not met: {e}")
+        return CalcularResponse(
+            success=False,
+            error=str(e)
+        )
+    except ErroOtimizacao as e:
+        logger.error(f"Constrained selection failed: {e}")
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"Error calculating scores: {e}", exc_info=True)
         return CalcularResponse(
@@ -151,6 +369,108 @@ async def calcular_numeros(request: CalcularRequest):
         )
 
 
+@app.websocket("/ws/calcular")
+async def calcular_websocket(websocket: WebSocket):
+    """
+    Interactive calculation session for slider updates.
+
+    The client sends JSON updates with any subset of the `/api/calcular`
+    fields; `pesos` may contain only the sliders that moved. An optional
+    `seq` value is echoed back. Updates received while a calculation is
+    running are merged and only the latest state is computed.
+
+    The first reply carries the full result (`tipo: "completo"`). Later
+    replies (`tipo: "delta"`) only include what changed: `movimentos`
+    (rank moves), `scores` (changed scores), and `numeros_principais`,
+    `pool_estendido`, `estatisticas`, `modo_inferencia`, `modo_selecao`,
+    `distribuicao_scores` or `explicacao` when they differ. `descartadas` counts superseded updates that were never computed.
+    Invalid updates get a `tipo: "erro"` reply and leave the session unchanged.
+    Calculations share the admission limit of `/api/calcular`; when
+    overloaded the reply is `tipo: "erro"` with `retry_after` (seconds); when
+    the selection solver times out or fails it carries `status_code: 503`.
+    If the service is still starting after the startup wait timeout, the
+    connection is closed with code 1013 (try again later).
+    """
+    await websocket.accept()
+    if not await readiness.wait(settings.STARTUP_WAIT_TIMEOUT):
+        await websocket.close(code=1013, reason="Service is starting")
+        return
+
+    sessao = CalculoSession()
+    nova_mensagem = asyncio.Event()
+
+    async def receber():
+        while True:
+            texto = await websocket.receive_text()
+            try:
+                mensagem = json.loads(texto)
+            except ValueError:
+                mensagem = None
+            sessao.queue_update(mensagem if isinstance(mensagem, dict) else {'_invalida': True})
+            nova_mensagem.set()
+
+    receptor = asyncio.create_task(receber())
+    try:
+        while True:
+            espera = asyncio.create_task(nova_mensagem.wait())
+            await asyncio.wait({espera, receptor}, return_when=asyncio.FIRST_COMPLETED)
+            if receptor.done():
+                espera.cancel()
+                break
+
+            nova_mensagem.clear()
+            atualizacao = sessao.take_update()
+            seq = atualizacao.get('seq')
+            descartadas, sessao.descartadas = sessao.descartadas, 0
+
+            if atualizacao.get('_invalida'):
+                await websocket.send_json({'tipo': 'erro', 'seq': seq, 'error': 'Invalid JSON object'})
+                continue
+
+            try:
+                request = sessao.merge_update(atualizacao)
+            except ValidationError as e:
+                await websocket.send_json({'tipo': 'erro', 'seq': seq, 'error': str(e)})
+                continue
+
+            if sessao.is_unchanged(request):
+                await websocket.send_json({'tipo': 'delta', 'seq': seq, 'descartadas': descartadas})
+                continue
+
+            try:
+                async with limitador_calculo.admit():
+                    resultados = await run_in_threadpool(_recommendations, request)
+                resultados = resultados.model_dump(by_alias=True)
+            except AdmissaoRecusada as e:
+                # The session state is kept; the client may resend later
+                await websocket.send_json({
+                    'tipo': 'erro', 'seq': seq, 'error': str(e), 'retry_after': e.retry_after
+                })
+                continue
+            except RestricoesInviaveis as e:
+                await websocket.send_json({'tipo': 'erro', 'seq': seq, 'error': str(e)})
+                continue
+            except ErroOtimizacao as e:
+                logger.error(f"Constrained selection failed over WebSocket: {e}")
+                await websocket.send_json({
+                    'tipo': 'erro', 'seq': seq, 'error': str(e), 'status_code': 503
+                })
+                continue
+            except Exception as e:
+                logger.error(f"Error calculating scores over WebSocket: {e}", exc_info=True)
+                await websocket.send_json({'tipo': 'erro', 'seq': seq, 'error': str(e)})
+                continue
+
+            mensagem = sessao.delta(request, resultados)
+            mensagem.update(seq=seq, descartadas=descartadas)
+            await websocket.send_json(mensagem)
+
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receptor.cancel()
+
+
 @app.get("/api/configuracao-padrao", response_model=ConfiguracaoPadrao, tags=["Configuration"])
 async def get_configuracao_padrao():
     """
@@ -169,7 +489,8 @@ async def get_configuracao_padrao():
     )
 
 
-@app.get("/api/dados-historicos", response_model=DadosHistoricos, tags=["Data"])
+@app.get("/api/dados-historicos", response_model=DadosHistoricos, tags=["Data"],
+         dependencies=[Depends(wait_until_ready)])
 async def get_dados_historicos():
     """
     Get information about the historical dataset.
@@ -184,12 +505,12 @@ async def get_dados_historicos():
     """
     try:
         # Get data from fuzzy engine
-        df = fuzzy_engine.dados_megasena
+        draws = fuzzy_engine.draws
 
         return DadosHistoricos(
-            total_concursos=len(df),
-            periodo_inicio=df['data'].min().strftime('%Y-%m-%d'),
-            periodo_fim=df['data'].max().strftime('%Y-%m-%d'),
+            total_concursos=len(draws),
+            periodo_inicio=draws.primeira_data.strftime('%Y-%m-%d'),
+            periodo_fim=draws.ultima_data.strftime('%Y-%m-%d'),
             total_numeros=60
         )
 
@@ -198,7 +519,167 @@ async def get_dados_historicos():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/coocorrencia", response_model=CoocorrenciaResponse, tags=["Data"],
+         dependencies=[Depends(wait_until_ready)])
+async def get_coocorrencia(
+    top: int = Query(default=20, ge=1, le=200, description="Number of pairs/triplets to list"),
+    numero: Optional[int] = Query(default=None, ge=1, le=60, description="List partners of this number"),
+    incluir_matriz: bool = Query(default=False, description="Include the full 60x60 matrix")
+):
+    """
+    Get pair co-occurrence statistics.
+
+    Counts come from a precomputed 60x60 matrix that is updated incrementally
+    as draws are added, so this endpoint never scans the history.
+
+    **Returns:**
+    - **top_pares**: Most frequent pairs with count and lift
+    - **top_triplets**: Most frequent triplets (if enabled in settings)
+    - **parceiros**: Most frequent partners of `numero` (if provided)
+    - **matriz**: Full pair count matrix (if `incluir_matriz` is true)
+    """
+    try:
+        coocorrencia = fuzzy_engine.coocorrencia
+
+        return CoocorrenciaResponse(
+            total_concursos=coocorrencia.total_sorteios,
+            esperado_par=coocorrencia.esperado_par,
+            top_pares=coocorrencia.top_pairs(top),
+            top_triplets=coocorrencia.top_triplets(top),
+            parceiros=coocorrencia.partners(numero, top) if numero else None,
+            matriz=coocorrencia.matriz.tolist() if incluir_matriz else None
+        )
+
+    except Exception as e:
+        logger.error(f"Error getting co-occurrence data: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/superficie", response_model=SuperficieResponse, tags=["Fuzzy"],
+         dependencies=[Depends(wait_until_ready)])
+async def get_superficie():
+    """
+    Get the status of the precomputed score surface.
+
+    The surface is built at startup when `SCORE_SURFACE_ENABLED` is set. It is
+    only used when its measured maximum error against exact inference is
+    within `SCORE_SURFACE_MAX_ERROR`; otherwise every request is exact.
+    """
+    if fuzzy_engine.superficie is None:
+        if 'superficie' in readiness.indisponiveis:
+            raise HTTPException(
+                status_code=503,
+                detail=f"Score surface is unavailable: {readiness.indisponiveis['superficie']}"
+            )
+        raise HTTPException(status_code=404, detail="Score surface is not enabled")
+
+    return SuperficieResponse(**fuzzy_engine.superficie.summary())
+
+
+@app.post("/api/jobs", response_model=JobResponse, status_code=202, tags=["Jobs"],
+          dependencies=[Depends(wait_until_ready), Depends(require_jobs)])
+async def submit_job(request: JobRequest):
+    """
+    Submit a heavy analysis to run in the background.
+
+    Jobs run on a bounded process pool and are tracked in a local SQLite table.
+    Submitting the same type and parameters again returns the existing job
+    (and its stored result, once finished) instead of running it twice.
+
+    **Types:**
+    - **varredura**: Sweep each variable weight from 0 to 100
+    - **backtest**: Walk-forward hit count over the most recent contests
+    - **enumeracao**: Rank every ticket that can be formed from the pool
+
+    At most `JOBS_MAX_QUEUE` jobs may be pending or running; beyond that new
+    submissions get 429 with `Retry-After`.
+
+    **Returns:** Job status. Poll `GET /api/jobs/{id}` and fetch the result from
+    `GET /api/jobs/{id}/resultado` when the status is `concluido`.
+    """
+    try:
+        parametros = JOB_PARAMETROS[request.tipo](**request.parametros)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    # Raises AdmissaoRecusada (429) when too many jobs are pending or running
+    job = job_manager.submit(request.tipo, parametros.model_dump(), fuzzy_engine.versao_dados)
+    logger.info(f"Job {job['id']} ({request.tipo}) submitted, reused={job['reaproveitado']}")
+
+    return JobResponse(**job)
+
+
+@app.get("/api/jobs/{job_id}", response_model=JobResponse, tags=["Jobs"],
+         dependencies=[Depends(wait_until_ready), Depends(require_jobs)])
+async def get_job(job_id: str):
+    """Get the status and progress of a background job."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return JobResponse(**job)
+
+
+@app.get("/api/jobs/{job_id}/resultado", response_model=JobResultadoResponse, tags=["Jobs"],
+         dependencies=[Depends(wait_until_ready), Depends(require_jobs)])
+async def get_job_resultado(job_id: str):
+    """Get the result of a finished background job."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job['status'] != CONCLUIDO:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+
+    return JobResultadoResponse(
+        id=job['id'],
+        tipo=job['tipo'],
+        resultado=job_manager.get_result(job_id)
+    )
+
+
+@app.delete("/api/jobs/{job_id}", response_model=JobResponse, tags=["Jobs"],
+            dependencies=[Depends(wait_until_ready), Depends(require_jobs)])
+async def cancel_job(job_id: str):
+    """
+    Cancel a pending or running background job.
+
+    Running jobs stop at their next progress report. Cancelling a job that
+    already ended has no effect.
+    """
+    if job_manager.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    job_manager.cancel(job_id)
+    return JobResponse(**job_manager.get(job_id))
+
+
+@app.get("/api/metricas/admissao", response_model=AdmissaoMetricasResponse, tags=["Health"])
+async def get_metricas_admissao():
+    """
+    Admission control metrics.
+
+    For each limited endpoint: configured limits, requests running and
+    queued now, peak queue depth, admitted and rejected counts (queue full
+    or wait timeout) and mean queue wait. Job queue load is included once
+    the job manager is running.
+    """
+    return AdmissaoMetricasResponse(
+        limitadores={limitador_calculo.nome: limitador_calculo.metrics()},
+        jobs=job_manager.metrics() if job_manager is not None else None
+    )
+
+
 # Error handlers
+@app.exception_handler(AdmissaoRecusada)
+async def admission_exception_handler(request, exc: AdmissaoRecusada):
+    """Overload rejections: 429/503 with Retry-After."""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"success": False, "error": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler."""
@@ -62,6 +62,45 @@ class Settings:
         "tendencia_soma": 50
     }
 
+    # Co-occurrence: also keep triplet counts (60^3 int32 array, ~0.9 MB)
+    COOCCURRENCE_TRIPLETS: bool = os.getenv("COOCCURRENCE_TRIPLETS", "false").lower() == "true"
+
+    # Background jobs (SQLite job table + process pool)
+    JOBS_DB_PATH: str = os.getenv("JOBS_DB_PATH", os.path.join(
+        os.path.dirname(__file__), "..", "data", "jobs.sqlite3"
+    ))
+    JOBS_MAX_WORKERS: int = int(os.getenv("JOBS_MAX_WORKERS", "2"))
+    # Pending + running jobs accepted before new submissions get 429
+    JOBS_MAX_QUEUE: int = int(os.getenv("JOBS_MAX_QUEUE", "20"))
+    JOBS_RETRY_AFTER: int = int(os.getenv("JOBS_RETRY_AFTER", "30"))
+
+    # Precomputed score surface over the weight grid (answers /api/calcular
+    # by interpolation when validated within the error budget)
+    SCORE_SURFACE_ENABLED: bool = os.getenv("SCORE_SURFACE_ENABLED", "false").lower() == "true"
+    SCORE_SURFACE_GRID_POINTS: int = int(os.getenv("SCORE_SURFACE_GRID_POINTS", "7"))
+    SCORE_SURFACE_MAX_ERROR: float = float(os.getenv("SCORE_SURFACE_MAX_ERROR", "0.05"))
+    SCORE_SURFACE_VALIDATION_SAMPLES: int = int(os.getenv("SCORE_SURFACE_VALIDATION_SAMPLES", "500"))
+
+    # Monte Carlo baseline for the recommendation statistics (built in the
+    # background at startup). Each worker process peaks around 150 MB, so the
+    # default runs in process; 0 = one process per CPU, up to 4
+    NULL_DISTRIBUTION_SAMPLES: int = int(os.getenv("NULL_DISTRIBUTION_SAMPLES", "1000000"))
+    NULL_DISTRIBUTION_SEED: int = int(os.getenv("NULL_DISTRIBUTION_SEED", "0"))
+    NULL_DISTRIBUTION_WORKERS: int = int(os.getenv("NULL_DISTRIBUTION_WORKERS", "1"))
+
+    # Admission control for score calculations (/api/calcular and the
+    # WebSocket session): concurrent executions, requests allowed to wait,
+    # maximum wait (s) and Retry-After (s) sent when rejecting
+    CALC_MAX_CONCURRENCY: int = int(os.getenv("CALC_MAX_CONCURRENCY", "4"))
+    CALC_MAX_QUEUE: int = int(os.getenv("CALC_MAX_QUEUE", "32"))
+    CALC_MAX_WAIT: float = float(os.getenv("CALC_MAX_WAIT", "2"))
+    CALC_RETRY_AFTER: int = int(os.getenv("CALC_RETRY_AFTER", "1"))
+
+    # Startup: requests arriving before the engine is ready wait up to this
+    # many seconds, then get 503 with Retry-After
+    STARTUP_WAIT_TIMEOUT: float = float(os.getenv("STARTUP_WAIT_TIMEOUT", "10"))
+    STARTUP_RETRY_AFTER: int = int(os.getenv("STARTUP_RETRY_AFTER", "5"))
+
     # Enable/disable debug mode
     DEBUG: bool = ENVIRONMENT == "development"
 
@@ -0,0 +1,199 @@
+"""
+Co-occurrence statistics for Mega-Sena draws
+
+Keeps a 60x60 pair count matrix (and optionally triplet counts) that can be
+updated incrementally as new draws are added.
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+TOTAL_NUMEROS = 60
+
+# Probability that two given numbers are drawn together in a 6-of-60 draw
+PROB_PAR = (6 / 60) * (5 / 59)
+
+# Position triples selecting the 20 triplets out of the 6 balls of a draw
+_TRIPLETS_POSICOES = np.array([
+    (a, b, c)
+    for a in range(6)
+    for b in range(a + 1, 6)
+    for c in range(b + 1, 6)
+])
+
+
+def _one_hot(sorteios: np.ndarray) -> np.ndarray:
+    """Convert an (N x 6) matrix of balls (1-60) into an (N x 60) indicator matrix."""
+    matriz = np.zeros((len(sorteios), TOTAL_NUMEROS), dtype=np.float64)
+    linhas = np.repeat(np.arange(len(sorteios)), sorteios.shape[1])
+    matriz[linhas, sorteios.ravel() - 1] = 1.0
+    return matriz
+
+
+class CooccurrenceIndex:
+    """
+    Pair (and optional triplet) co-occurrence counts for numbers 1-60.
+
+    The pair matrix is built with a single one-hot matrix product
+    (``X.T @ X``) over the draw matrix. Its diagonal holds the plain
+    frequency of each number. New draws are folded in with the same
+    product over the new rows only, so updates cost O(new draws).
+    """
+
+    def __init__(self, sorteios: np.ndarray, incluir_triplets: bool = False):
+        """
+        Build the index from an (N x 6) matrix of drawn numbers.
+
+        Args:
+            sorteios: Draw matrix, one row per contest, values 1-60
+            incluir_triplets: Also maintain triplet counts (60^3 int32 array)
+        """
+        self.total_sorteios = 0
+        self.matriz = np.zeros((TOTAL_NUMEROS, TOTAL_NUMEROS), dtype=np.int64)
+        self.triplets: Optional[np.ndarray] = (
+            np.zeros(TOTAL_NUMEROS ** 3, dtype=np.int32) if incluir_triplets else None
+        )
+
+        self.add_draws(sorteios)
+
+    def add_draws(self, sorteios: np.ndarray):
+        """Fold new draws into the counts."""
+        sorteios = np.asarray(sorteios, dtype=np.int64).reshape(-1, 6)
+        if len(sorteios) == 0:
+            return
+
+        if sorteios.min() < 1 or sorteios.max() > TOTAL_NUMEROS:
+            raise ValueError("Drawn numbers must be between 1 and 60")
+
+        one_hot = _one_hot(sorteios)
+        self.matriz += (one_hot.T @ one_hot).astype(np.int64)
+        self.total_sorteios += len(sorteios)
+
+        if self.triplets is not None:
+            ordenados = np.sort(sorteios, axis=1) - 1
+            trios = ordenados[:, _TRIPLETS_POSICOES]
+            codigos = (
+                trios[..., 0] * TOTAL_NUMEROS ** 2 + trios[..., 1] * TOTAL_NUMEROS + trios[..., 2]
+            ).ravel()
+            self.triplets += np.bincount(
+                codigos, minlength=TOTAL_NUMEROS ** 3
+            ).astype(np.int32)
+
+    @property
+    def esperado_par(self) -> float:
+        """Expected count for any pair under uniform random draws."""
+        return self.total_sorteios * PROB_PAR
+
+    def lift(self) -> np.ndarray:
+        """Observed / expected pair counts (60 x 60, diagonal set to 1)."""
+        if self.total_sorteios == 0:
+            return np.ones((TOTAL_NUMEROS, TOTAL_NUMEROS))
+
+        lift = self.matriz / self.esperado_par
+        np.fill_diagonal(lift, 1.0)
+        return lift
+
+    def top_pairs(self, n: int = 20) -> List[Dict]:
+        """Most frequent pairs."""
+        i, j = np.triu_indices(TOTAL_NUMEROS, k=1)
+        contagens = self.matriz[i, j]
+        ordem = np.argsort(-contagens, kind='stable')[:n]
+        esperado = self.esperado_par or 1.0
+
+        return [
+            {
+                'numeros': [int(i[k]) + 1, int(j[k]) + 1],
+                'contagem': int(contagens[k]),
+                'lift': float(contagens[k] / esperado)
+            }
+            for k in ordem
+        ]
+
+    def top_triplets(self, n: int = 20) -> List[Dict]:
+        """Most frequent triplets (empty if triplets are disabled)."""
+        if self.triplets is None:
+            return []
+
+        ordem = np.argsort(-self.triplets, kind='stable')[:n]
+        return [
+            {
+                'numeros': [
+                    int(codigo // TOTAL_NUMEROS ** 2) + 1,
+                    int(codigo // TOTAL_NUMEROS % TOTAL_NUMEROS) + 1,
+                    int(codigo % TOTAL_NUMEROS) + 1
+                ],
+                'contagem': int(self.triplets[codigo])
+            }
+            for codigo in ordem
+            if self.triplets[codigo] > 0
+        ]
+
+    def partners(self, numero: int, n: int = 10) -> List[Dict]:
+        """Numbers most often drawn together with ``numero``."""
+        if numero < 1 or numero > TOTAL_NUMEROS:
+            raise ValueError("Number must be between 1 and 60")
+
+        linha = self.matriz[numero - 1].copy()
+        linha[numero - 1] = -1
+        ordem = np.argsort(-linha, kind='stable')[:n]
+        esperado = self.esperado_par or 1.0
+
+        return [
+            {
+                'numeros': [numero, int(k) + 1],
+                'contagem': int(linha[k]),
+                'lift': float(linha[k] / esperado)
+            }
+            for k in ordem
+        ]
+
+    def rerank(self, candidatos: Sequence[Tuple[int, float]], n: int,
+               peso: float, fixos: Sequence[int] = ()) -> List[int]:
+        """
+        Greedily pick ``n`` numbers from scored candidates using pair affinity.
+
+        Each step picks the candidate maximizing
+        ``score * (1 + peso * (mean_lift_with_selected - 1))``.
+        Positive ``peso`` favours numbers that often come out together with
+        those already selected; negative ``peso`` diversifies the selection.
+        ``peso == 0`` keeps the original score order.
+
+        Args:
+            candidatos: (numero, score) pairs, best first
+            n: Total number of picks, including ``fixos``
+            peso: Affinity weight (-1 to 1)
+            fixos: Numbers that are always selected first (e.g. main picks)
+
+        Returns:
+            Selected numbers in pick order
+        """
+        escolhidos = [int(numero) for numero in fixos][:n]
+        restantes = [(int(numero), score) for numero, score in candidatos
+                     if int(numero) not in escolhidos]
+
+        if peso == 0 or not restantes:
+            return escolhidos + [numero for numero, _ in restantes[:n - len(escolhidos)]]
+
+        numeros = np.array([numero for numero, _ in restantes], dtype=np.int64)
+        scores = np.array([score for _, score in restantes], dtype=np.float64)
+        lift = self.lift()
+
+        disponivel = np.ones(len(numeros), dtype=bool)
+        soma_lift = np.zeros(len(numeros))
+        for numero in escolhidos:
+            soma_lift += lift[numeros - 1, numero - 1]
+
+        while len(escolhidos) < n and disponivel.any():
+            if escolhidos:
+                ajustado = scores * (1 + peso * (soma_lift / len(escolhidos) - 1))
+            else:
+                ajustado = scores.copy()
+            ajustado[~disponivel] = -np.inf
+
+            k = int(np.argmax(ajustado))
+            escolhidos.append(int(numeros[k]))
+            disponivel[k] = False
+            soma_lift += lift[numeros - 1, numeros[k] - 1]
+
+        return escolhidos
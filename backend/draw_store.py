@@ -0,0 +1,348 @@
+"""
+Compact array-backed storage for Mega-Sena draws
+
+Replaces the per-ball DataFrame with three contiguous arrays:
+balls as an (N x 6) uint8 matrix, dates as int32 day ordinals and contest
+ids as int32. Draws are kept in ascending contest order.
+
+Draws can also be persisted as a flat binary file of fixed-size records
+(see ``REGISTRO_BINARIO``), which can be appended to without rewriting it.
+
+Run as a script to print a memory report comparing it with the DataFrames
+the engine used to keep:
+
+    python draw_store.py
+"""
+
+import datetime
+import numpy as np
+import pandas as pd
+from typing import Iterable, Optional, Tuple
+
+
+# Day ordinal (datetime.date.toordinal) of the Unix epoch
+_ORDINAL_EPOCH = datetime.date(1970, 1, 1).toordinal()
+
+# Minimum number of rows allocated when a buffer grows
+_CAPACIDADE_MINIMA = 64
+
+
+# Record layout of the binary draw file: contest id, day ordinal, balls
+REGISTRO_BINARIO = np.dtype([('concurso', '<i4'), ('data', '<i4'), ('numeros', 'u1', (6,))])
+
+
+def write_binary(path: str, concursos: np.ndarray, datas: np.ndarray,
+                 numeros: np.ndarray, append: bool = True):
+    """
+    Write draws as binary records.
+
+    Args:
+        path: Target file
+        concursos: Contest ids
+        datas: Day ordinals (see ``to_ordinals``)
+        numeros: (N x 6) matrix of balls (1-60)
+        append: Append to the file instead of replacing it
+    """
+    registros = np.empty(len(concursos), dtype=REGISTRO_BINARIO)
+    registros['concurso'] = concursos
+    registros['data'] = datas
+    registros['numeros'] = np.asarray(numeros).reshape(-1, 6)
+
+    with open(path, 'ab' if append else 'wb') as f:
+        registros.tofile(f)
+
+
+def to_ordinals(datas) -> np.ndarray:
+    """Convert dates (strings, datetimes or datetime64) to int32 day ordinals."""
+    dias = pd.to_datetime(np.asarray(datas)).values.astype('datetime64[D]').astype(np.int64)
+    return (dias + _ORDINAL_EPOCH).astype(np.int32)
+
+
+def reserve_rows(array: np.ndarray, necessarias: int, usadas: int) -> np.ndarray:
+    """
+    ``array`` with room for ``necessarias`` rows, keeping its first ``usadas``.
+
+    Returns ``array`` itself when it is large enough, otherwise a copy with
+    at least twice the rows, so appending costs amortized O(1) per row.
+    """
+    if necessarias <= len(array):
+        return array
+
+    capacidade = max(necessarias, 2 * len(array), _CAPACIDADE_MINIMA)
+    novo = np.empty((capacidade,) + array.shape[1:], dtype=array.dtype)
+    novo[:usadas] = array[:usadas]
+    return novo
+
+
+class DrawStore:
+    """
+    Contiguous, append-friendly storage for draws.
+
+    Public accessors return read-only views of the underlying buffers, so
+    filtering by position or contest never copies the history.
+    """
+
+    __slots__ = ('_numeros', '_datas', '_concursos', '_tamanho')
+
+    def __init__(self, capacidade: int = 0):
+        """Create an empty store with room for ``capacidade`` draws."""
+        self._numeros = np.empty((capacidade, 6), dtype=np.uint8)
+        self._datas = np.empty(capacidade, dtype=np.int32)
+        self._concursos = np.empty(capacidade, dtype=np.int32)
+        self._tamanho = 0
+
+    @classmethod
+    def from_arrays(cls, concursos: np.ndarray, datas: np.ndarray,
+                    numeros: np.ndarray) -> 'DrawStore':
+        """Build a store from contest ids, day ordinals and an (N x 6) ball matrix."""
+        store = cls(capacidade=len(concursos))
+        store.append(concursos, datas, numeros)
+        return store
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'DrawStore':
+        """Build a store from a DataFrame with columns concurso, data, n1..n6."""
+        return cls.from_arrays(
+            df['concurso'].to_numpy(),
+            to_ordinals(df['data']),
+            df[['n1', 'n2', 'n3', 'n4', 'n5', 'n6']].to_numpy()
+        )
+
+    @classmethod
+    def from_csv(cls, path: str) -> 'DrawStore':
+        """Load the semicolon-separated results file used by the engine."""
+        df = pd.read_csv(path, delimiter=';')
+        df.columns = ['concurso', 'data', 'n1', 'n2', 'n3', 'n4', 'n5', 'n6']
+        return cls.from_dataframe(df)
+
+    @classmethod
+    def from_binary(cls, path: str) -> 'DrawStore':
+        """Load a file written with ``write_binary`` (records in any order)."""
+        registros = np.fromfile(path, dtype=REGISTRO_BINARIO)
+        return cls.from_arrays(registros['concurso'], registros['data'], registros['numeros'])
+
+    def to_binary(self, path: str):
+        """Write the whole store as binary records, replacing ``path``."""
+        write_binary(path, self.concursos, self.datas, self.numeros, append=False)
+
+    def _view(self, inicio: int, fim: int) -> 'DrawStore':
+        """Store sharing the buffers of rows [inicio, fim)."""
+        view = DrawStore.__new__(DrawStore)
+        view._numeros = self._numeros[inicio:fim]
+        view._datas = self._datas[inicio:fim]
+        view._concursos = self._concursos[inicio:fim]
+        view._tamanho = fim - inicio
+        # Capacity equals size, so appending to a view always reallocates
+        # instead of writing into the parent's buffers.
+        return view
+
+    def _reservar(self, extra: int):
+        """Make room for ``extra`` more rows, growing geometrically."""
+        for nome in ('_numeros', '_datas', '_concursos'):
+            setattr(self, nome, reserve_rows(getattr(self, nome), self._tamanho + extra, self._tamanho))
+
+    def append(self, concursos: np.ndarray, datas: np.ndarray,
+               numeros: np.ndarray) -> np.ndarray:
+        """
+        Add draws, ignoring contests that are already stored.
+
+        Args:
+            concursos: Contest ids
+            datas: Day ordinals (see ``to_ordinals``)
+            numeros: (N x 6) matrix of balls (1-60)
+
+        Returns:
+            Boolean mask over the input rows that were actually added
+        """
+        concursos = np.asarray(concursos, dtype=np.int64)
+        datas = np.asarray(datas, dtype=np.int64)
+        numeros = np.asarray(numeros, dtype=np.int64).reshape(-1, 6)
+
+        if len(numeros) and (numeros.min() < 1 or numeros.max() > 60):
+            raise ValueError("Drawn numbers must be between 1 and 60")
+
+        # Drop contests already stored and duplicates within the input
+        _, primeiros = np.unique(concursos, return_index=True)
+        novos = np.zeros(len(concursos), dtype=bool)
+        novos[primeiros] = True
+        novos &= ~self.contains(concursos)
+
+        quantidade = int(novos.sum())
+        if quantidade == 0:
+            return novos
+
+        self._reservar(quantidade)
+        inicio, fim = self._tamanho, self._tamanho + quantidade
+        self._concursos[inicio:fim] = concursos[novos]
+        self._datas[inicio:fim] = datas[novos]
+        self._numeros[inicio:fim] = numeros[novos]
+        self._tamanho = fim
+
+        # Keep ascending contest order (only needed for out-of-order input)
+        ativos = self._concursos[:fim]
+        if np.any(ativos[1:] < ativos[:-1]):
+            ordem = np.argsort(ativos, kind='stable')
+            self._concursos[:fim] = ativos[ordem]
+            self._datas[:fim] = self._datas[:fim][ordem]
+            self._numeros[:fim] = self._numeros[:fim][ordem]
+
+        return novos
+
+    def __len__(self) -> int:
+        return self._tamanho
+
+    @staticmethod
+    def _somente_leitura(array: np.ndarray) -> np.ndarray:
+        view = array.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def numeros(self) -> np.ndarray:
+        """(N x 6) uint8 view of the drawn balls, oldest contest first."""
+        return self._somente_leitura(self._numeros[:self._tamanho])
+
+    @property
+    def datas(self) -> np.ndarray:
+        """int32 view of the draw dates as day ordinals."""
+        return self._somente_leitura(self._datas[:self._tamanho])
+
+    @property
+    def concursos(self) -> np.ndarray:
+        """int32 view of the contest ids."""
+        return self._somente_leitura(self._concursos[:self._tamanho])
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the used part of the buffers."""
+        return self._tamanho * (6 * 1 + 4 + 4)
+
+    def contains(self, concursos: Iterable[int]) -> np.ndarray:
+        """Boolean mask telling which contest ids are stored."""
+        concursos = np.asarray(concursos, dtype=np.int64)
+        ativos = self._concursos[:self._tamanho]
+        if len(ativos) == 0:
+            return np.zeros(concursos.shape, dtype=bool)
+
+        posicoes = np.searchsorted(ativos, concursos).clip(max=len(ativos) - 1)
+        return ativos[posicoes] == concursos
+
+    def recent(self, n: int) -> 'DrawStore':
+        """View of the ``n`` most recent draws."""
+        return self._view(max(self._tamanho - n, 0), self._tamanho)
+
+    def rows_between(self, concurso_inicio: Optional[int] = None, concurso_fim: Optional[int] = None,
+                     data_inicio: Optional[datetime.date] = None,
+                     data_fim: Optional[datetime.date] = None) -> Tuple[int, int]:
+        """
+        Row range [inicio, fim) of the draws within the given bounds.
+
+        All bounds are inclusive and optional; contest and date bounds can
+        be combined. Dates follow contest order in the history.
+
+        Returns:
+            (inicio, fim) row indexes, empty when no draw matches
+        """
+        ativos = self._concursos[:self._tamanho]
+        datas = self._datas[:self._tamanho]
+        inicio, fim = 0, self._tamanho
+
+        if concurso_inicio is not None:
+            inicio = max(inicio, int(np.searchsorted(ativos, concurso_inicio)))
+        if concurso_fim is not None:
+            fim = min(fim, int(np.searchsorted(ativos, concurso_fim, side='right')))
+        if data_inicio is not None:
+            inicio = max(inicio, int(np.searchsorted(datas, data_inicio.toordinal())))
+        if data_fim is not None:
+            fim = min(fim, int(np.searchsorted(datas, data_fim.toordinal(), side='right')))
+
+        return inicio, max(inicio, fim)
+
+    def date(self, indice: int) -> datetime.date:
+        """Date of the draw at row ``indice`` (negative indexes allowed)."""
+        return datetime.date.fromordinal(int(self.datas[indice]))
+
+    @property
+    def primeira_data(self) -> Optional[datetime.date]:
+        return self.date(0) if self._tamanho else None
+
+    @property
+    def ultima_data(self) -> Optional[datetime.date]:
+        return self.date(-1) if self._tamanho else None
+
+    @property
+    def ultimo_concurso(self) -> Optional[int]:
+        return int(self._concursos[self._tamanho - 1]) if self._tamanho else None
+
+
+def _historico_sintetico(n: int, seed: int = 0) -> pd.DataFrame:
+    """Random history with ``n`` draws, in the engine's DataFrame layout."""
+    rng = np.random.default_rng(seed)
+    numeros = np.argsort(rng.random((n, 60)), axis=1)[:, :6] + 1
+
+    df = pd.DataFrame(numeros, columns=['n1', 'n2', 'n3', 'n4', 'n5', 'n6'])
+    df.insert(0, 'concurso', np.arange(1, n + 1))
+    # Two draws a week; day resolution keeps 100x histories within datetime64 range
+    dias = np.datetime64('1996-03-11', 'D') + (np.arange(n) * 7) // 2
+    df.insert(1, 'data', dias.astype('datetime64[us]'))
+    return df.sort_values('concurso', ascending=False).reset_index(drop=True)
+
+
+def _historico_por_bola(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-ball DataFrame (concurso, data, numero, posicao) as the engine used to build it."""
+    n = len(df)
+    return pd.DataFrame({
+        'concurso': np.repeat(df['concurso'].to_numpy(), 6),
+        'data': np.repeat(df['data'].to_numpy(), 6),
+        'numero': df[['n1', 'n2', 'n3', 'n4', 'n5', 'n6']].to_numpy().ravel(),
+        'posicao': np.tile(np.arange(1, 7), n)
+    })
+
+
+def memory_report(tamanho_base: int, fatores=(1, 10, 100)) -> pd.DataFrame:
+    """
+    Compare DrawStore memory with the legacy DataFrames at several history sizes.
+
+    Args:
+        tamanho_base: Number of draws in the real history
+        fatores: Multipliers applied to ``tamanho_base``
+
+    Returns:
+        DataFrame with bytes used by each representation per size
+    """
+    linhas = []
+    for fator in fatores:
+        df = _historico_sintetico(tamanho_base * fator)
+        por_bola = _historico_por_bola(df)
+        store = DrawStore.from_dataframe(df)
+
+        bytes_df = int(df.memory_usage(deep=True).sum())
+        bytes_por_bola = int(por_bola.memory_usage(deep=True).sum())
+
+        linhas.append({
+            'fator': fator,
+            'concursos': len(store),
+            'dados_megasena_bytes': bytes_df,
+            'historico_numeros_bytes': bytes_por_bola,
+            'draw_store_bytes': store.nbytes,
+            'reducao': (bytes_df + bytes_por_bola) / store.nbytes
+        })
+
+    return pd.DataFrame(linhas)
+
+
+if __name__ == "__main__":
+    from config import settings
+
+    base = len(DrawStore.from_csv(settings.DATA_PATH))
+    relatorio = memory_report(base)
+
+    print(f"Memory report (base history: {base} draws)\n")
+    for _, linha in relatorio.iterrows():
+        print(
+            f"{int(linha['fator']):>4}x {int(linha['concursos']):>8} draws | "
+            f"dados_megasena {linha['dados_megasena_bytes'] / 1024:>10.1f} KiB | "
+            f"historico_numeros {linha['historico_numeros_bytes'] / 1024:>10.1f} KiB | "
+            f"DrawStore {linha['draw_store_bytes'] / 1024:>8.1f} KiB | "
+            f"{linha['reducao']:>6.1f}x smaller"
+        )
@@ -0,0 +1,194 @@
+"""
+Vectorized Mamdani inference over many input rows at once
+
+Mirrors what ``skfuzzy.control.ControlSystemSimulation`` computes for a
+single input (fmin AND, fmax accumulation, min implication and centroid
+defuzzification over the upsampled output universe), but evaluates a whole
+(M x variables) input matrix with NumPy instead of one row at a time.
+"""
+
+import numpy as np
+from typing import Dict, List, Sequence
+
+
+# Rows evaluated per chunk (bounds the temporary (rows x points) arrays)
+TAMANHO_LOTE = 16384
+
+
+class BatchMamdani:
+    """
+    Batched evaluator built from the same skfuzzy objects as the simulator.
+
+    Membership functions are taken from the skfuzzy terms as sampled on
+    their universes, so results match ``ControlSystemSimulation`` up to
+    floating point rounding.
+    """
+
+    def __init__(self, antecedentes: Sequence, consequente, regras: Sequence):
+        """
+        Args:
+            antecedentes: skfuzzy Antecedents, in input column order
+            consequente: skfuzzy Consequent
+            regras: skfuzzy Rules (antecedents combined with AND only)
+        """
+        self.variaveis = [a.label for a in antecedentes]
+        self._universos = [np.asarray(a.universe, dtype=np.float64) for a in antecedentes]
+
+        # Flat list of input terms: (variable index, term label, sampled mf)
+        self.termos_entrada: List[str] = []
+        self._termos_variavel: List[int] = []
+        self._mfs_entrada: List[np.ndarray] = []
+        indice_termo: Dict = {}
+        for v, antecedente in enumerate(antecedentes):
+            for rotulo, termo in antecedente.terms.items():
+                indice_termo[(antecedente.label, rotulo)] = len(self.termos_entrada)
+                self.termos_entrada.append(f"{antecedente.label}[{rotulo}]")
+                self._termos_variavel.append(v)
+                self._mfs_entrada.append(np.asarray(termo.mf, dtype=np.float64))
+
+        self.termos_saida = list(consequente.terms)
+        self._universo_saida = np.asarray(consequente.universe, dtype=np.float64)
+        self._mfs_saida = np.array([consequente.terms[t].mf for t in self.termos_saida], dtype=np.float64)
+
+        # Rules as lists of input term indexes plus an output term index
+        self._regras_termos: List[List[int]] = []
+        self._regras_saida: List[int] = []
+        self.descricao_regras: List[str] = []
+        for regra in regras:
+            if not _only_and(regra.antecedent):
+                raise ValueError("Batched inference only supports AND-combined antecedents")
+            self._regras_termos.append([
+                indice_termo[(t.parent.label, t.label)] for t in regra.antecedent_terms
+            ])
+            (saida,) = regra.consequent
+            self._regras_saida.append(self.termos_saida.index(saida.term.label))
+            self.descricao_regras.append(
+                ' & '.join(self.termos_entrada[k] for k in self._regras_termos[-1])
+                + f" -> {consequente.label}[{saida.term.label}]"
+            )
+
+    @property
+    def total_regras(self) -> int:
+        return len(self._regras_termos)
+
+    def evaluate(self, entradas: np.ndarray, detalhes: bool = False):
+        """
+        Evaluate the rule base for every input row.
+
+        Args:
+            entradas: (M x variables) crisp inputs
+            detalhes: Also return the intermediate membership degrees
+
+        Returns:
+            (M,) scores; rows where no output term is active score 0.0
+            (as ``calculate_score`` does). With ``detalhes``, a tuple
+            ``(scores, dict)`` where the dict holds ``pertinencias``
+            (M x input terms), ``ativacoes`` (M x rules) and ``cortes``
+            (M x output terms).
+        """
+        entradas = np.atleast_2d(np.asarray(entradas, dtype=np.float64))
+        partes = [
+            self._evaluate_chunk(entradas[inicio:inicio + TAMANHO_LOTE], detalhes)
+            for inicio in range(0, len(entradas), TAMANHO_LOTE)
+        ] or [self._evaluate_chunk(entradas, detalhes)]
+
+        if not detalhes:
+            return np.concatenate(partes)
+
+        scores = np.concatenate([p[0] for p in partes])
+        extras = {
+            chave: np.concatenate([p[1][chave] for p in partes])
+            for chave in ('pertinencias', 'ativacoes', 'cortes')
+        }
+        return scores, extras
+
+    def _evaluate_chunk(self, entradas: np.ndarray, detalhes: bool):
+        m = len(entradas)
+
+        # 1. Fuzzification (inputs clipped to their universes, like skfuzzy)
+        pertinencias = np.empty((m, len(self.termos_entrada)))
+        for k, (v, mf) in enumerate(zip(self._termos_variavel, self._mfs_entrada)):
+            universo = self._universos[v]
+            x = np.clip(entradas[:, v], universo.min(), universo.max())
+            pertinencias[:, k] = np.interp(x, universo, mf)
+
+        # 2. Rule firing strength (AND = fmin)
+        ativacoes = np.empty((m, self.total_regras))
+        for r, termos in enumerate(self._regras_termos):
+            ativacoes[:, r] = pertinencias[:, termos].min(axis=1)
+
+        # 3. Accumulation per output term (fmax)
+        cortes = np.zeros((m, len(self.termos_saida)))
+        for r, saida in enumerate(self._regras_saida):
+            np.maximum(cortes[:, saida], ativacoes[:, r], out=cortes[:, saida])
+
+        scores = self._defuzzify(cortes)
+
+        if detalhes:
+            return scores, {'pertinencias': pertinencias, 'ativacoes': ativacoes, 'cortes': cortes}
+        return scores
+
+    def _defuzzify(self, cortes: np.ndarray) -> np.ndarray:
+        """Centroid of the clipped output set, sampled like skfuzzy does."""
+        universo = self._universo_saida
+        x0, x1 = universo[:-1], universo[1:]
+        m = len(cortes)
+
+        # Upsampled universe: original points plus, for every output term,
+        # the points where its membership crosses the cut level. Segments
+        # without a crossing contribute a duplicate of their left point,
+        # which adds zero-width segments only.
+        pontos = [np.broadcast_to(universo, (m, len(universo)))]
+        for t, mf in enumerate(self._mfs_saida):
+            y0, y1 = mf[:-1], mf[1:]
+            corte = cortes[:, t:t + 1]
+            acima = np.where(corte == 0, mf > corte, mf >= corte)
+            cruza = acima[:, :-1] != acima[:, 1:]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                x = x0 + (corte - y0) * (x1 - x0) / (y1 - y0)
+            pontos.append(np.where(cruza, x, x0))
+        pontos = np.sort(np.concatenate(pontos, axis=1), axis=1)
+
+        # Aggregated output membership at every point
+        saida = np.zeros_like(pontos)
+        for t, mf in enumerate(self._mfs_saida):
+            np.maximum(
+                saida,
+                np.minimum(cortes[:, t:t + 1], np.interp(pontos, universo, mf)),
+                out=saida
+            )
+
+        # Piecewise-linear centroid (same case split as skfuzzy.defuzzify.centroid)
+        xa, xb = pontos[:, :-1], pontos[:, 1:]
+        ya, yb = saida[:, :-1], saida[:, 1:]
+        dx = xb - xa
+        with np.errstate(divide='ignore', invalid='ignore'):
+            momento = np.where(
+                ya == yb, 0.5 * (xa + xb),
+                np.where(
+                    ya == 0, 2.0 / 3.0 * dx + xa,
+                    np.where(
+                        yb == 0, 1.0 / 3.0 * dx + xa,
+                        (2.0 / 3.0 * dx * (yb + 0.5 * ya)) / (ya + yb) + xa
+                    )
+                )
+            )
+        area = np.where(ya == yb, dx * ya, 0.5 * dx * (ya + yb))
+        ignorar = ((ya == 0) & (yb == 0)) | (dx == 0)
+        area = np.where(ignorar, 0.0, area)
+        momento = np.where(ignorar, 0.0, momento)
+
+        soma_area = area.sum(axis=1)
+        scores = (momento * area).sum(axis=1) / np.fmax(soma_area, np.finfo(float).eps)
+
+        # skfuzzy raises when the output set is empty; calculate_score maps it to 0
+        return np.where(saida.sum(axis=1) == 0, 0.0, scores)
+
+
+def _only_and(agregado) -> bool:
+    """Whether a skfuzzy antecedent tree only uses AND."""
+    if not hasattr(agregado, 'kind'):
+        return True
+    if agregado.kind != 'and':
+        return False
+    return _only_and(agregado.term1) and _only_and(agregado.term2)
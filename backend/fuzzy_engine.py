@@ -7,8 +7,34 @@ import pandas as pd
 import numpy as np
 import skfuzzy as fuzz
 from skfuzzy import control as ctrl
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+import datetime
 import os
+import threading
+
+from cooccurrence import CooccurrenceIndex
+from decay import DecayIndex
+from draw_store import DrawStore, to_ordinals
+from fuzzy_batch import BatchMamdani
+from models import DEZENAS
+from null_distribution import NullDistributions
+from pool_optimizer import select_numbers
+from prefix_cube import PrefixCube
+from score_surface import ScoreSurface
+
+
+# Decimal places kept in explanation arrays (memberships are 0-1)
+CASAS_EXPLICACAO = 4
+
+# Fuzzy input variables, in the column order of dados_fuzzy
+VARIAVEIS_FUZZY = [
+    'frequencia_historica', 'tempo_ausencia', 'distribuicao_posicional',
+    'equilibrio_par_impar', 'tendencia_soma'
+]
+
+# Recent draws behind the even/odd balance and the sum tendency
+JANELA_PARIDADE = 20
+JANELA_SOMA = 50
 
 
 class FuzzyMegaSenaEngine:
@@ -25,20 +51,35 @@ class FuzzyMegaSenaEngine:
     Output: Interest Score (0-10)
     """
 
-    def __init__(self, data_path: str = None):
-        """Initialize the fuzzy engine and load data."""
+    def __init__(self, data_path: str = None, incluir_triplets: bool = False):
+        """
+        Initialize the fuzzy engine and load data.
+
+        Args:
+            data_path: Path to the historical CSV file
+            incluir_triplets: Also maintain triplet co-occurrence counts
+        """
         if data_path is None:
             # Default path to data file
             data_path = os.path.join(os.path.dirname(__file__), "..", "data", "megascsv.csv")
 
         self.data_path = data_path
-        self.dados_megasena = None
-        self.historico_numeros = None
+        self.incluir_triplets = incluir_triplets
+        self.draws: DrawStore = None
         self.dados_fuzzy = None
+        self.coocorrencia = None
+        self.decaimento: DecayIndex = None
+        self.cubo: PrefixCube = None
+        # Optional precomputed score surface (see build_score_surface)
+        self.superficie: Optional[ScoreSurface] = None
+        # Optional Monte Carlo baseline for the statistics (see build_null_distributions)
+        self.distribuicoes_nulas: Optional[NullDistributions] = None
 
         # Fuzzy system components
         self.sistema_controle = None
         self.simulador = None
+        # The skfuzzy simulation keeps per-run state; serialize access to it
+        self._trava_simulador = threading.Lock()
 
         # Initialize the system
         self._load_data()
@@ -47,218 +88,162 @@ class FuzzyMegaSenaEngine:
 
     def _load_data(self):
         """Load the Mega-Sena CSV data."""
-        self.dados_megasena = pd.read_csv(self.data_path, delimiter=';')
-        self.dados_megasena.columns = ['concurso', 'data', 'n1', 'n2', 'n3', 'n4', 'n5', 'n6']
-        self.dados_megasena['data'] = pd.to_datetime(self.dados_megasena['data'], format='%Y-%m-%d')
-        self.dados_megasena = self.dados_megasena.sort_values('concurso', ascending=False).reset_index(drop=True)
-
-        # Extract historical numbers
-        self.historico_numeros = self._extrair_numeros_historicos(self.dados_megasena)
-
-    def _extrair_numeros_historicos(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Extract historical numbers with metadata."""
-        numeros_historicos = []
-
-        for _, row in df.iterrows():
-            concurso = row['concurso']
-            data = row['data']
-            numeros = [row['n1'], row['n2'], row['n3'], row['n4'], row['n5'], row['n6']]
+        self.draws = DrawStore.from_csv(self.data_path)
 
-            for posicao, numero in enumerate(numeros, 1):
-                numeros_historicos.append({
-                    'concurso': concurso,
-                    'data': data,
-                    'numero': numero,
-                    'posicao': posicao
-                })
-
-        return pd.DataFrame(numeros_historicos)
+        # Pair co-occurrence counts
+        self.coocorrencia = CooccurrenceIndex(
+            self.draws.numeros,
+            incluir_triplets=self.incluir_triplets
+        )
 
-    def _calculate_fuzzy_variables(self):
-        """Calculate all 5 fuzzy input variables for all 60 numbers."""
-        # 1. Frequency
-        frequencia = self._calcular_frequencia_numeros(self.historico_numeros)
+        # Running time-decayed counts
+        self.decaimento = DecayIndex(self.draws.numeros)
 
-        # 2. Absence time
-        tempo_ausencia = self._calcular_tempo_ausencia(self.dados_megasena, self.historico_numeros)
+        # Cumulative counts for arbitrary contest/date ranges
+        self.cubo = PrefixCube(self.draws.numeros, self.draws.datas)
 
-        # 3. Positional distribution
-        dist_posicional = self._calcular_distribuicao_posicional(self.historico_numeros)
+    def add_draws(self, novos_sorteios: pd.DataFrame) -> int:
+        """
+        Add new draws to the dataset and refresh the fuzzy variables.
 
-        # 4. Even/Odd balance
-        equilibrio = self._calcular_equilibrio_par_impar(self.dados_megasena)
+        Contests already present are ignored. Co-occurrence, decayed and
+        cumulative counts are updated incrementally with the new draws only.
 
-        # 5. Sum tendency
-        tendencia = self._calcular_tendencia_soma(self.dados_megasena)
+        Args:
+            novos_sorteios: DataFrame with columns concurso, data, n1..n6
 
-        # Consolidate all variables
-        self.dados_fuzzy = self._consolidar_variaveis_fuzzy(
-            frequencia, tempo_ausencia, dist_posicional, equilibrio, tendencia
+        Returns:
+            Number of draws actually added
+        """
+        numeros = novos_sorteios[['n1', 'n2', 'n3', 'n4', 'n5', 'n6']].to_numpy()
+        ultimo_concurso = self.draws.ultimo_concurso
+        adicionados = self.draws.append(
+            novos_sorteios['concurso'].to_numpy(),
+            to_ordinals(novos_sorteios['data']),
+            numeros
         )
 
-    def _calcular_frequencia_numeros(self, historico: pd.DataFrame) -> pd.DataFrame:
-        """Calculate frequency of appearance for each number."""
-        todos_numeros = pd.DataFrame({'numero': range(1, 61)})
-        freq_count = historico['numero'].value_counts().reset_index()
-        freq_count.columns = ['numero', 'frequencia']
-
-        frequencia = todos_numeros.merge(freq_count, on='numero', how='left')
-        frequencia['frequencia'] = frequencia['frequencia'].fillna(0)
-
-        return frequencia.sort_values('numero')
+        if not adicionados.any():
+            return 0
 
-    def _calcular_tempo_ausencia(self, df: pd.DataFrame, historico: pd.DataFrame) -> pd.DataFrame:
-        """Calculate absence time for each number."""
-        ultima_data = df['data'].max()
-        tempo_ausencia = []
+        self.coocorrencia.add_draws(numeros[adicionados])
 
-        for numero in range(1, 61):
-            aparicoes = historico[historico['numero'] == numero]
-
-            if len(aparicoes) > 0:
-                ultima_aparicao = aparicoes['data'].max()
-                dias_ausencia = (ultima_data - ultima_aparicao).days
-            else:
-                dias_ausencia = 999
+        # Decay and prefixes depend on draw order: extend them when the new
+        # contests come after the stored ones, rebuild otherwise
+        concursos = novos_sorteios['concurso'].to_numpy()[adicionados]
+        if ultimo_concurso is None or concursos.min() > ultimo_concurso:
+            self.decaimento.add_draws(numeros[adicionados][np.argsort(concursos, kind='stable')])
+            primeiro_novo = len(self.draws) - len(concursos)
+            self.cubo.add_draws(self.draws.numeros[primeiro_novo:], self.draws.datas[primeiro_novo:])
+        else:
+            self.decaimento = DecayIndex(self.draws.numeros)
+            self.cubo = PrefixCube(self.draws.numeros, self.draws.datas)
 
-            tempo_ausencia.append({
-                'numero': numero,
-                'dias_ausencia': dias_ausencia
-            })
+        self._calculate_fuzzy_variables()
 
-        return pd.DataFrame(tempo_ausencia)
+        # The surface tabulates the previous fuzzy variables
+        if self.superficie is not None:
+            superficie = self.superficie
+            self.build_score_surface(
+                superficie.pontos_grade, superficie.orcamento_erro, superficie.amostras_validacao
+            )
 
-    def _calcular_distribuicao_posicional(self, historico: pd.DataFrame) -> pd.DataFrame:
-        """Calculate positional distribution uniformity for each number."""
-        distribuicao_posicional = []
+        return int(adicionados.sum())
 
-        for numero in range(1, 61):
-            aparicoes_numero = historico[historico['numero'] == numero]
+    @property
+    def versao_dados(self) -> str:
+        """Dataset version (draw count and last contest), changed by new draws."""
+        return f"{len(self.draws)}:{self.draws.ultimo_concurso}"
 
-            if len(aparicoes_numero) > 0:
-                count_posicoes = aparicoes_numero['posicao'].value_counts().sort_index()
+    def _calculate_fuzzy_variables(self):
+        """Calculate all 5 fuzzy input variables for all 60 numbers over the full history."""
+        self.dados_fuzzy = self._variaveis_intervalo(0, len(self.draws), JANELA_PARIDADE, JANELA_SOMA)
 
-                for pos in range(1, 7):
-                    if pos not in count_posicoes.index:
-                        count_posicoes.loc[pos] = 0
+    def fuzzy_variables_before(self, concurso: int) -> pd.DataFrame:
+        """
+        Calculate the fuzzy variables using only draws before ``concurso``.
 
-                count_posicoes = count_posicoes.sort_index()
+        Used by backtests to score a contest without looking at it.
 
-                if len(count_posicoes) > 0:
-                    media = count_posicoes.mean()
-                    if media > 0:
-                        cv = count_posicoes.std() / media
-                        uniformidade = max(0, 100 - (cv * 100))
-                    else:
-                        uniformidade = 0
-                else:
-                    uniformidade = 0
-            else:
-                uniformidade = 0
+        Args:
+            concurso: Contest number (exclusive upper bound)
 
-            distribuicao_posicional.append({
-                'numero': numero,
-                'uniformidade_posicional': uniformidade
-            })
+        Returns:
+            DataFrame in the same format as ``dados_fuzzy``
+        """
+        _, fim = self.draws.rows_between(concurso_fim=concurso - 1)
 
-        return pd.DataFrame(distribuicao_posicional)
+        if fim == 0:
+            raise ValueError(f"No draws before contest {concurso}")
 
-    def _calcular_equilibrio_par_impar(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Calculate even/odd balance score for each number."""
-        equilibrio_scores = []
-        ultimos_concursos = df.head(20)
+        return self._variaveis_intervalo(0, fim, JANELA_PARIDADE, JANELA_SOMA)
 
-        for numero in range(1, 61):
-            is_par = (numero % 2 == 0)
-            total_pares = 0
-            total_impares = 0
+    def range_fuzzy_variables(self, concurso_inicio: Optional[int] = None,
+                              concurso_fim: Optional[int] = None,
+                              data_inicio: Optional[datetime.date] = None,
+                              data_fim: Optional[datetime.date] = None,
+                              janela_paridade: int = JANELA_PARIDADE,
+                              janela_soma: int = JANELA_SOMA) -> pd.DataFrame:
+        """
+        Calculate the fuzzy variables over a contest and/or date range.
 
-            for _, row in ultimos_concursos.iterrows():
-                numeros_concurso = [row['n1'], row['n2'], row['n3'], row['n4'], row['n5'], row['n6']]
-                pares_concurso = sum(1 for n in numeros_concurso if n % 2 == 0)
-                impares_concurso = 6 - pares_concurso
+        Every statistic comes from differences of the cumulative counts in
+        ``self.cubo``, so this costs O(60) whatever the range size.
 
-                total_pares += pares_concurso
-                total_impares += impares_concurso
+        Args:
+            concurso_inicio: First contest (inclusive, default: first stored)
+            concurso_fim: Last contest (inclusive, default: last stored)
+            data_inicio: First draw date (inclusive)
+            data_fim: Last draw date (inclusive)
+            janela_paridade: Last draws of the range behind the even/odd balance
+            janela_soma: Last draws of the range behind the sum tendency
 
-            total_numeros = total_pares + total_impares
-            prop_pares = total_pares / total_numeros if total_numeros > 0 else 0.5
+        Returns:
+            DataFrame in the same format as ``dados_fuzzy``
+        """
+        inicio, fim = self.draws.rows_between(concurso_inicio, concurso_fim, data_inicio, data_fim)
+
+        if fim == inicio:
+            raise ValueError("No draws in the requested range")
+
+        return self._variaveis_intervalo(inicio, fim, janela_paridade, janela_soma)
+
+    def _variaveis_intervalo(self, inicio: int, fim: int, janela_paridade: int,
+                             janela_soma: int) -> pd.DataFrame:
+        """Fuzzy variables of rows [inicio, fim) of the history, from the prefix cube."""
+        cubo = self.cubo
+        prop_pares = cubo.even_share(max(inicio, fim - janela_paridade), fim)
+        media_somas = cubo.mean_sum(max(inicio, fim - janela_soma), fim)
+
+        return pd.DataFrame({
+            'numero': np.arange(1, 61),
+            'frequencia_historica': _min_max(cubo.frequency(inicio, fim)),
+            'tempo_ausencia': _min_max(cubo.absence_days(inicio, fim)),
+            'distribuicao_posicional': _uniformidade_posicional(cubo.positional_counts(inicio, fim)),
+            'equilibrio_par_impar': _equilibrio_par_impar(prop_pares),
+            'tendencia_soma': _tendencia_soma(media_somas)
+        })
+
+    def decayed_fuzzy_variables(self, meia_vida: float) -> pd.DataFrame:
+        """
+        Fuzzy variables with time-decayed frequency and positional distribution.
 
-            if is_par:
-                score = (1 - prop_pares) * 100
-            else:
-                score = prop_pares * 100
-
-            equilibrio_scores.append({
-                'numero': numero,
-                'equilibrio_par_impar': score
-            })
-
-        return pd.DataFrame(equilibrio_scores)
-
-    def _calcular_tendencia_soma(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Calculate sum tendency score for each number."""
-        ultimos_concursos = df.head(50)
-        somas = []
-
-        for _, row in ultimos_concursos.iterrows():
-            soma = row['n1'] + row['n2'] + row['n3'] + row['n4'] + row['n5'] + row['n6']
-            somas.append(soma)
-
-        media_somas = np.mean(somas)
-        tendencia_soma = []
-
-        for numero in range(1, 61):
-            contribuicao_ideal = media_somas / 6
-            distancia = abs(numero - contribuicao_ideal)
-            max_distancia = max(abs(1 - contribuicao_ideal), abs(60 - contribuicao_ideal))
-            score = max(0, 100 * (1 - distancia / max_distancia))
-
-            tendencia_soma.append({
-                'numero': numero,
-                'tendencia_soma': score
-            })
-
-        return pd.DataFrame(tendencia_soma)
-
-    def _consolidar_variaveis_fuzzy(self, freq, ausencia, dist, equilibrio, tendencia) -> pd.DataFrame:
-        """Consolidate and normalize all fuzzy variables."""
-        dados_fuzzy = pd.DataFrame({'numero': range(1, 61)})
-
-        # Normalize frequency
-        freq_norm = freq.copy()
-        max_freq = freq_norm['frequencia'].max()
-        min_freq = freq_norm['frequencia'].min()
-        freq_norm['frequencia_normalizada'] = (
-            (freq_norm['frequencia'] - min_freq) / (max_freq - min_freq) * 100
-        )
+        A draw ``a`` draws old weighs ``0.5 ** (a / meia_vida)``. Counts come
+        from the running decay accumulators, so this costs O(60) whatever
+        the history size. The other variables are unchanged.
 
-        # Normalize absence time
-        ausencia_norm = ausencia.copy()
-        max_ausencia = ausencia_norm['dias_ausencia'].max()
-        min_ausencia = ausencia_norm['dias_ausencia'].min()
-        ausencia_norm['ausencia_normalizada'] = (
-            (ausencia_norm['dias_ausencia'] - min_ausencia) /
-            (max_ausencia - min_ausencia) * 100
-        )
+        Args:
+            meia_vida: Half-life in draws (1-4096)
 
-        # Merge all variables
-        dados_fuzzy = dados_fuzzy.merge(
-            freq_norm[['numero', 'frequencia_normalizada']], on='numero'
-        ).merge(
-            ausencia_norm[['numero', 'ausencia_normalizada']], on='numero'
-        ).merge(
-            dist[['numero', 'uniformidade_posicional']], on='numero'
-        ).merge(
-            equilibrio[['numero', 'equilibrio_par_impar']], on='numero'
-        ).merge(
-            tendencia[['numero', 'tendencia_soma']], on='numero'
-        )
+        Returns:
+            DataFrame in the same format as ``dados_fuzzy``
+        """
+        frequencia = self.decaimento.frequency(meia_vida)
+        posicoes = self.decaimento.positional_counts(meia_vida)
 
-        dados_fuzzy.columns = [
-            'numero', 'frequencia_historica', 'tempo_ausencia',
-            'distribuicao_posicional', 'equilibrio_par_impar', 'tendencia_soma'
-        ]
+        dados_fuzzy = self.dados_fuzzy.copy()
+        dados_fuzzy['frequencia_historica'] = _min_max(frequencia)
+        dados_fuzzy['distribuicao_posicional'] = _uniformidade_posicional(posicoes)
 
         return dados_fuzzy
 
@@ -362,9 +347,70 @@ class FuzzyMegaSenaEngine:
 
         # Create control system
         self.sistema_controle = ctrl.ControlSystem(regras)
-        self.simulador = ctrl.ControlSystemSimulation(self.sistema_controle)
+        self.simulador = ctrl.ControlSystemSimulation(self.sistema_controle, cache=False)
+
+        # Batched evaluator over the same terms and rules
+        self.inferencia = BatchMamdani(
+            [frequencia_historica, tempo_ausencia, distribuicao_posicional,
+             equilibrio_par_impar, tendencia_soma],
+            score_interesse,
+            regras
+        )
+
+    def _entradas(self, dados_fuzzy: pd.DataFrame, pesos: Dict[str, float] = None) -> np.ndarray:
+        """(60 x 5) inference inputs: fuzzy variables scaled by the weights."""
+        entradas = dados_fuzzy[VARIAVEIS_FUZZY].to_numpy(dtype=np.float64)
+
+        if pesos:
+            # Weights are percentages (0-100), normalize to 0-1
+            entradas = entradas * np.array([pesos.get(v, 100) / 100 for v in VARIAVEIS_FUZZY])
+
+        return entradas
+
+    def build_score_surface(self, pontos_grade: int = 7, orcamento_erro: float = 0.05,
+                            amostras_validacao: int = 500) -> ScoreSurface:
+        """
+        Precompute the score surface used by ``modo_inferencia='auto'``.
+
+        Args:
+            pontos_grade: Grid points per weight axis
+            orcamento_erro: Maximum accepted score error; above it the surface
+                stays inactive and exact inference is used
+            amostras_validacao: Random weight vectors checked against exact inference
+
+        Returns:
+            The new surface
+        """
+        self.superficie = ScoreSurface(
+            self.inferencia,
+            self._entradas(self.dados_fuzzy),
+            pontos_grade=pontos_grade,
+            orcamento_erro=orcamento_erro,
+            amostras_validacao=amostras_validacao
+        )
+        return self.superficie
+
+    def build_null_distributions(self, amostras: int = 1_000_000, seed: int = 0,
+                                 workers: int = 1) -> NullDistributions:
+        """
+        Simulate uniform random draws to get percentiles for ``estatisticas``.
+
+        The distributions only depend on the game rules, not on the history,
+        so they are built once.
+
+        Args:
+            amostras: Simulated draws
+            seed: Random seed
+            workers: Worker processes (1 = in process, 0 = one per CPU)
+
+        Returns:
+            The built distributions
+        """
+        self.distribuicoes_nulas = NullDistributions(amostras, seed, workers).build()
+        return self.distribuicoes_nulas
 
-    def calculate_score(self, numero: int, pesos: Dict[str, float] = None) -> float:
+    def calculate_score(self, numero: int, pesos: Dict[str, float] = None,
+                        dados_fuzzy: pd.DataFrame = None) -> float:
         """
         Calculate fuzzy score for a specific number.
 
@@ -372,6 +418,7 @@ class FuzzyMegaSenaEngine:
             numero: Number to analyze (1-60)
             pesos: Optional weights for each variable (0-100%)
                    If None, uses original values. If provided, applies weights.
+            dados_fuzzy: Optional fuzzy variables to use instead of ``self.dados_fuzzy``
 
         Returns:
             Fuzzy score (0-10)
@@ -379,8 +426,11 @@ class FuzzyMegaSenaEngine:
         if numero < 1 or numero > 60:
             raise ValueError("Number must be between 1 and 60")
 
+        if dados_fuzzy is None:
+            dados_fuzzy = self.dados_fuzzy
+
         # Get base values for the number
-        linha_numero = self.dados_fuzzy[self.dados_fuzzy['numero'] == numero].iloc[0]
+        linha_numero = dados_fuzzy[dados_fuzzy['numero'] == numero].iloc[0]
 
         # Apply weights if provided
         if pesos:
@@ -405,48 +455,109 @@ class FuzzyMegaSenaEngine:
             soma = linha_numero['tendencia_soma']
 
         try:
-            # Feed inputs to simulator
-            self.simulador.input['frequencia_historica'] = freq
-            self.simulador.input['tempo_ausencia'] = ausencia
-            self.simulador.input['distribuicao_posicional'] = dist
-            self.simulador.input['equilibrio_par_impar'] = equilibrio
-            self.simulador.input['tendencia_soma'] = soma
-
-            # Compute fuzzy inference
-            self.simulador.compute()
-
-            return self.simulador.output['score_interesse']
+            with self._trava_simulador:
+                # Feed inputs to simulator
+                self.simulador.input['frequencia_historica'] = freq
+                self.simulador.input['tempo_ausencia'] = ausencia
+                self.simulador.input['distribuicao_posicional'] = dist
+                self.simulador.input['equilibrio_par_impar'] = equilibrio
+                self.simulador.input['tendencia_soma'] = soma
+
+                # Compute fuzzy inference
+                self.simulador.compute()
+
+                return self.simulador.output['score_interesse']
         except Exception:
             return 0.0
 
-    def calculate_all_scores(self, pesos: Dict[str, float] = None) -> pd.DataFrame:
+    def calculate_all_scores(self, pesos: Dict[str, float] = None,
+                             dados_fuzzy: pd.DataFrame = None,
+                             meia_vida: Optional[float] = None) -> pd.DataFrame:
         """
         Calculate fuzzy scores for all 60 numbers.
 
         Args:
             pesos: Optional weights for each variable (0-100%)
+            dados_fuzzy: Optional fuzzy variables to use instead of ``self.dados_fuzzy``
+            meia_vida: Optional half-life in draws; uses time-decayed frequency
+                and positional distribution (see ``decayed_fuzzy_variables``)
 
         Returns:
             DataFrame with all numbers and their scores
         """
-        scores = []
+        if dados_fuzzy is None and meia_vida is not None:
+            dados_fuzzy = self.decayed_fuzzy_variables(meia_vida)
 
-        for numero in range(1, 61):
-            score = self.calculate_score(numero, pesos)
-            scores.append({
-                'numero': numero,
-                'score': score
-            })
+        return self._pontuar(pesos, dados_fuzzy)[0]
 
-        df_scores = pd.DataFrame(scores)
+    def _pontuar(self, pesos: Dict[str, float] = None, dados_fuzzy: pd.DataFrame = None,
+                 modo_inferencia: str = 'exata',
+                 explicar: bool = False) -> Tuple[pd.DataFrame, str, Optional[Dict]]:
+        """
+        Score all 60 numbers.
 
-        # Merge with original fuzzy data
-        resultado = self.dados_fuzzy.merge(df_scores, on='numero')
+        ``'auto'`` answers from the score surface when one is active and the
+        engine's own fuzzy variables are used; anything else is exact.
+        With ``explicar`` the scores always come from exact inference, whose
+        intermediate memberships and rule activations are kept from the
+        same pass.
 
-        return resultado.sort_values('score', ascending=False).reset_index(drop=True)
+        Returns:
+            (scores sorted descending, mode used, explanation or None)
+        """
+        usar_superficie = (
+            modo_inferencia == 'auto'
+            and not explicar
+            and dados_fuzzy is None
+            and self.superficie is not None
+            and self.superficie.ativa
+        )
+
+        if dados_fuzzy is None:
+            dados_fuzzy = self.dados_fuzzy
+
+        resultado = dados_fuzzy.copy()
+        explicacao = None
+        if usar_superficie:
+            resultado['score'] = self.superficie.scores(pesos, VARIAVEIS_FUZZY)
+        elif explicar:
+            resultado['score'], detalhes = self.inferencia.evaluate(
+                self._entradas(dados_fuzzy, pesos), detalhes=True
+            )
+            explicacao = self._explicacao(dados_fuzzy, detalhes)
+        else:
+            # All 60 numbers in a single batched inference pass
+            resultado['score'] = self.inferencia.evaluate(self._entradas(dados_fuzzy, pesos))
+
+        resultado = resultado.sort_values('score', ascending=False).reset_index(drop=True)
+        return resultado, 'superficie' if usar_superficie else 'exata', explicacao
+
+    def _explicacao(self, dados_fuzzy: pd.DataFrame, detalhes: Dict) -> Dict:
+        """Compact (shape + flat row-major values) explanation arrays."""
+        def compactar(matriz: np.ndarray) -> Dict:
+            return {
+                'forma': list(matriz.shape),
+                'valores': np.round(matriz, CASAS_EXPLICACAO).ravel().tolist()
+            }
+
+        return {
+            'numeros': [int(x) for x in dados_fuzzy['numero']],
+            'termos': self.inferencia.termos_entrada,
+            'regras': self.inferencia.descricao_regras,
+            'termos_saida': self.inferencia.termos_saida,
+            'pertinencias': compactar(detalhes['pertinencias']),
+            'ativacoes': compactar(detalhes['ativacoes']),
+            'cortes': compactar(detalhes['cortes'])
+        }
 
     def get_recommendations(self, pesos: Dict[str, float] = None,
-                           top_n: int = 6, pool_n: int = 12) -> Dict:
+                           top_n: int = 6, pool_n: int = 12,
+                           peso_coocorrencia: float = 0.0,
+                           modo_inferencia: str = 'exata',
+                           meia_vida: Optional[float] = None,
+                           incluir_explicacao: bool = False,
+                           dados_fuzzy: Optional[pd.DataFrame] = None,
+                           restricoes: Optional[Dict] = None) -> Dict:
         """
         Get number recommendations based on fuzzy scores.
 
@@ -454,15 +565,50 @@ class FuzzyMegaSenaEngine:
             pesos: Optional weights for each variable
             top_n: Number of top recommendations (default 6)
             pool_n: Size of extended pool (default 12)
+            peso_coocorrencia: Pair affinity weight used to rerank the
+                extended pool (-1 to 1). Positive values favour numbers
+                often drawn with the main picks, negative values diversify.
+                0 keeps plain score order.
+            modo_inferencia: 'auto' to use the precomputed score surface
+                when it is active, 'exata' to always run inference
+            meia_vida: Optional half-life in draws for time-decayed frequency
+                and positional distribution (always scored exactly)
+            incluir_explicacao: Add the per-term memberships and per-rule
+                activations of every number to ``dados_graficos``
+            dados_fuzzy: Optional fuzzy variables to score instead of
+                ``self.dados_fuzzy`` (e.g. from ``range_fuzzy_variables``)
+            restricoes: Optional even/odd, tens bucket and sum constraints
+                (see ``RestricoesSelecao``); the main numbers are then the
+                highest total score set that meets them, and the extended
+                pool adds the best remaining numbers to them
+
+        Raises:
+            RestricoesInviaveis: If no set of numbers meets ``restricoes``
 
         Returns:
             Dictionary with recommendations and statistics
         """
         # Calculate all scores
-        resultados = self.calculate_all_scores(pesos)
+        if dados_fuzzy is None and meia_vida is not None:
+            dados_fuzzy = self.decayed_fuzzy_variables(meia_vida)
+        resultados, modo_usado, explicacao = self._pontuar(
+            pesos, dados_fuzzy, modo_inferencia, explicar=incluir_explicacao
+        )
 
         # Get top numbers
-        top_numeros = resultados.head(top_n)
+        if restricoes is not None:
+            escolhidos = select_numbers(
+                resultados['numero'].to_numpy(), resultados['score'].to_numpy(), top_n,
+                pares_min=restricoes.get('pares_min', 0),
+                pares_max=restricoes.get('pares_max'),
+                dezenas_min=[restricoes.get('dezenas_min', {}).get(d, 0) for d in DEZENAS],
+                dezenas_max=[restricoes.get('dezenas_max', {}).get(d, top_n) for d in DEZENAS],
+                soma_min=restricoes.get('soma_min', 0),
+                soma_max=restricoes.get('soma_max')
+            )
+            top_numeros = resultados.set_index('numero').loc[escolhidos].reset_index()
+        else:
+            top_numeros = resultados.head(top_n)
         pool_numeros = resultados.head(pool_n)
 
         # Prepare response
@@ -474,7 +620,15 @@ class FuzzyMegaSenaEngine:
             for _, row in top_numeros.iterrows()
         ]
 
-        pool_estendido = [int(x) for x in pool_numeros['numero'].tolist()]
+        if peso_coocorrencia or restricoes is not None:
+            pool_estendido = self.coocorrencia.rerank(
+                list(zip(resultados['numero'].tolist(), resultados['score'].tolist())),
+                n=pool_n,
+                peso=peso_coocorrencia,
+                fixos=[x['numero'] for x in numeros_principais]
+            )
+        else:
+            pool_estendido = [int(x) for x in pool_numeros['numero'].tolist()]
 
         # Calculate statistics
         main_numbers = [x['numero'] for x in numeros_principais]
@@ -531,10 +685,53 @@ class FuzzyMegaSenaEngine:
                 'impares': impares,
                 'media_score': float(resultados['score'].mean()),
                 'desvio_padrao': float(resultados['score'].std()),
-                'distribuicao_dezenas': distribuicao_dezenas
+                'distribuicao_dezenas': distribuicao_dezenas,
+                'percentis': (
+                    self.distribuicoes_nulas.percentiles(main_numbers)
+                    if self.distribuicoes_nulas is not None else None
+                )
             },
             'dados_graficos': {
                 'todos_scores': todos_scores,
-                'distribuicao_scores': distribuicao_scores
-            }
+                'distribuicao_scores': distribuicao_scores,
+                'explicacao': explicacao
+            },
+            'modo_inferencia': modo_usado,
+            'modo_selecao': 'otimizada' if restricoes is not None else 'top'
         }
+
+
+def _uniformidade_posicional(count_posicoes: np.ndarray) -> np.ndarray:
+    """Uniformity (0-100) of (60 x 6) per-position counts: 100 minus the CV in %."""
+    media = count_posicoes.mean(axis=1)
+    desvio = count_posicoes.std(axis=1, ddof=1)
+
+    uniformidade = np.zeros(len(count_posicoes))
+    aparece = media > 0
+    cv = desvio[aparece] / media[aparece]
+    uniformidade[aparece] = np.maximum(0, 100 - (cv * 100))
+
+    return uniformidade
+
+
+def _min_max(valores: np.ndarray) -> np.ndarray:
+    """Min-max normalization to 0-100 (all zeros when the values are flat)."""
+    amplitude = valores.max() - valores.min()
+    if amplitude == 0:
+        return np.zeros(len(valores))
+    return (valores - valores.min()) / amplitude * 100
+
+
+def _equilibrio_par_impar(prop_pares: float) -> np.ndarray:
+    """Even/odd balance (0-100) of each number given the recent share of even balls."""
+    numeros = np.arange(1, 61)
+    return np.where(numeros % 2 == 0, (1 - prop_pares) * 100, prop_pares * 100)
+
+
+def _tendencia_soma(media_somas: float) -> np.ndarray:
+    """Sum tendency (0-100): closeness of each number to a sixth of the recent mean sum."""
+    numeros = np.arange(1, 61)
+    contribuicao_ideal = media_somas / 6
+    distancia = np.abs(numeros - contribuicao_ideal)
+    max_distancia = max(abs(1 - contribuicao_ideal), abs(60 - contribuicao_ideal))
+    return np.maximum(0, 100 * (1 - distancia / max_distancia))
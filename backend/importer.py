@@ -0,0 +1,480 @@
+"""
+Streaming importer for official Mega-Sena result exports
+
+Reads CSV, XLSX or HTML table dumps row by row, normalizes them to the
+engine's schema (concurso, data, six balls in draw order), validates them
+and appends the new contests to the results CSV and, optionally, to the
+binary draw file (see ``draw_store.write_binary``).
+
+Rows are written in batches, so memory does not grow with the file size;
+only the set of contest ids seen so far is kept.
+
+Usage (from the backend directory):
+
+    python importer.py resultados.xlsx
+    python importer.py d_megasc.htm --binario ../data/megasena.draws
+    python importer.py export.csv --simular     # validate only, write nothing
+"""
+
+import argparse
+import csv
+import datetime
+import html.parser
+import logging
+import os
+import re
+import sys
+import time
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Set
+
+import numpy as np
+
+from config import settings
+from draw_store import DrawStore, to_ordinals, write_binary
+
+logger = logging.getLogger(__name__)
+
+
+# Rows written per batch
+TAMANHO_LOTE = 10_000
+
+# Bytes read per chunk when streaming text files
+TAMANHO_BLOCO = 64 * 1024
+
+# Invalid rows reported in detail (the rest are only counted)
+MAX_ERROS_DETALHADOS = 20
+
+# Header of the engine's results CSV
+CABECALHO_CSV = ['lottery', 'date_occured', 'ball_01', 'ball_02', 'ball_03',
+                 'ball_04', 'ball_05', 'ball_06']
+
+# Normalized header names (see _normalizar_cabecalho) for each column
+ALIASES_CONCURSO = {'concurso', 'lottery', 'contest', 'numeroconcurso'}
+ALIASES_DATA = {'data', 'datasorteio', 'datadosorteio', 'dateoccured', 'date', 'dataapuracao'}
+PADRAO_BOLA = re.compile(r'^(?:(?:bola|ball|dezena|n|coluna)0?([1-6])|([1-6])a?dezena)$')
+
+# Integers with '.' thousands separators ('2.222'); other dotted values are decimals
+PADRAO_MILHAR = re.compile(r'^\d{1,3}(\.\d{3})+$')
+
+# Candidate CSV delimiters
+DELIMITADORES = (';', ',', '\t')
+
+# Lines searched for the header row when picking the CSV delimiter
+MAX_LINHAS_ANTES_CABECALHO = 100
+
+FORMATOS_DATA = ('%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', '%d/%m/%y')
+
+
+class ErroImportacao(ValueError):
+    """Raised when a file cannot be imported (unknown format or missing columns)."""
+
+
+@dataclass
+class RelatorioImportacao:
+    """Outcome of an import."""
+    linhas_lidas: int = 0
+    # Distinct contests written to at least one target
+    importados: int = 0
+    # Contests already in every target or repeated in the file
+    duplicados: int = 0
+    invalidos: int = 0
+    ignorados: int = 0
+    duracao_s: float = 0.0
+    erros: List[str] = field(default_factory=list)
+    # Per target path: contests written ('inseridos') and already there ('existentes')
+    destinos: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    @property
+    def linhas_por_segundo(self) -> float:
+        return self.linhas_lidas / self.duracao_s if self.duracao_s > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        dados = dict(self.__dict__)
+        dados['linhas_por_segundo'] = self.linhas_por_segundo
+        return dados
+
+
+# ---------------------------------------------------------------------------
+# Row readers: each yields rows as lists of raw cell values
+# ---------------------------------------------------------------------------
+
+def _ler_csv(path: str, encoding: str) -> Iterator[Sequence]:
+    with open(path, encoding=encoding, errors='replace', newline='') as f:
+        # Title lines may precede the header: use the delimiter that splits a
+        # line into a header, or the most frequent one in the first line
+        anteriores: List[str] = []
+        delimitador = None
+        for texto in f:
+            anteriores.append(texto)
+            delimitador = next((
+                d for d in DELIMITADORES
+                if _mapear_colunas(next(csv.reader([texto], delimiter=d), [])) is not None
+            ), None)
+            if delimitador or len(anteriores) >= MAX_LINHAS_ANTES_CABECALHO:
+                break
+
+        if delimitador is None:
+            delimitador = max(DELIMITADORES, key=anteriores[0].count) if anteriores else ';'
+        yield from csv.reader(anteriores, delimiter=delimitador)
+        yield from csv.reader(f, delimiter=delimitador)
+
+
+def _ler_xlsx(path: str) -> Iterator[Sequence]:
+    try:
+        import openpyxl
+    except ImportError:
+        raise ErroImportacao("Reading XLSX files requires openpyxl (pip install openpyxl)")
+
+    # Read-only mode streams rows from the sheet XML instead of loading it
+    livro = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from livro.active.iter_rows(values_only=True)
+    finally:
+        livro.close()
+
+
+class _TabelaHTML(html.parser.HTMLParser):
+    """Collects the cell texts of every ``<tr>`` fed so far."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.linhas: List[List[str]] = []
+        self._linha: Optional[List[str]] = None
+        self._celula: Optional[List[str]] = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'tr':
+            self._fechar_linha()
+            self._linha = []
+        elif tag in ('td', 'th') and self._linha is not None:
+            self._fechar_celula()
+            self._celula = []
+
+    def handle_endtag(self, tag):
+        if tag in ('td', 'th'):
+            self._fechar_celula()
+        elif tag in ('tr', 'table'):
+            self._fechar_linha()
+
+    def handle_data(self, data):
+        if self._celula is not None:
+            self._celula.append(data)
+
+    def _fechar_celula(self):
+        if self._celula is not None and self._linha is not None:
+            self._linha.append(' '.join(''.join(self._celula).split()))
+        self._celula = None
+
+    def _fechar_linha(self):
+        self._fechar_celula()
+        if self._linha:
+            self.linhas.append(self._linha)
+        self._linha = None
+
+
+def _ler_html(path: str, encoding: str) -> Iterator[Sequence]:
+    tabela = _TabelaHTML()
+    with open(path, encoding=encoding, errors='replace') as f:
+        while True:
+            bloco = f.read(TAMANHO_BLOCO)
+            if not bloco:
+                break
+            tabela.feed(bloco)
+            yield from tabela.linhas
+            tabela.linhas.clear()
+
+    tabela.close()
+    tabela._fechar_linha()
+    yield from tabela.linhas
+
+
+def detect_format(path: str) -> str:
+    """Guess the file format ('csv', 'xlsx' or 'html') from its extension."""
+    extensao = os.path.splitext(path)[1].lower()
+    if extensao in ('.xlsx', '.xlsm'):
+        return 'xlsx'
+    if extensao in ('.htm', '.html'):
+        return 'html'
+    if extensao in ('.csv', '.txt'):
+        return 'csv'
+    raise ErroImportacao(f"Unknown file format: {extensao or path}")
+
+
+def read_rows(path: str, formato: Optional[str] = None,
+              encoding: str = 'utf-8-sig') -> Iterator[Sequence]:
+    """Stream the raw rows of a CSV, XLSX or HTML file."""
+    formato = formato or detect_format(path)
+    if formato == 'csv':
+        return _ler_csv(path, encoding)
+    if formato == 'xlsx':
+        return _ler_xlsx(path)
+    if formato == 'html':
+        return _ler_html(path, encoding)
+    raise ErroImportacao(f"Unknown file format: {formato}")
+
+
+# ---------------------------------------------------------------------------
+# Normalization and validation
+# ---------------------------------------------------------------------------
+
+def _normalizar_cabecalho(valor) -> str:
+    """Lowercase ASCII letters and digits only ('1ª Dezena' -> '1adezena')."""
+    texto = unicodedata.normalize('NFKD', str(valor or '')).encode('ascii', 'ignore').decode()
+    return re.sub(r'[^a-z0-9]', '', texto.lower())
+
+
+def _mapear_colunas(linha: Sequence) -> Optional[Dict[str, int]]:
+    """Column index of concurso, data and n1..n6, or None if ``linha`` is not a header."""
+    colunas: Dict[str, int] = {}
+    for indice, valor in enumerate(linha):
+        nome = _normalizar_cabecalho(valor)
+        bola = PADRAO_BOLA.match(nome)
+        if nome in ALIASES_CONCURSO:
+            colunas.setdefault('concurso', indice)
+        elif nome in ALIASES_DATA:
+            colunas.setdefault('data', indice)
+        elif bola:
+            colunas.setdefault(f"n{bola.group(1) or bola.group(2)}", indice)
+
+    necessarias = {'concurso', 'data', 'n1', 'n2', 'n3', 'n4', 'n5', 'n6'}
+    return colunas if necessarias <= set(colunas) else None
+
+
+def _inteiro(valor) -> int:
+    if isinstance(valor, float):
+        if not valor.is_integer():
+            raise ValueError(f"not an integer: {valor}")
+        return int(valor)
+    if isinstance(valor, int):
+        return valor
+    texto = str(valor).strip()
+    if PADRAO_MILHAR.match(texto):
+        return int(texto.replace('.', ''))
+    try:
+        return int(texto)
+    except ValueError:
+        # Decimal text ('1.0') is accepted only for whole numbers
+        return _inteiro(float(texto))
+
+
+def _data(valor) -> datetime.date:
+    if isinstance(valor, datetime.datetime):
+        return valor.date()
+    if isinstance(valor, datetime.date):
+        return valor
+
+    texto = str(valor).strip()[:10]
+    for formato in FORMATOS_DATA:
+        try:
+            return datetime.datetime.strptime(texto, formato).date()
+        except ValueError:
+            continue
+    raise ValueError(f"invalid date: {valor!r}")
+
+
+def normalize_row(linha: Sequence, colunas: Dict[str, int]):
+    """
+    Convert a raw row to ``(concurso, date, [n1..n6])``.
+
+    Raises:
+        ValueError: If a column is missing, a value cannot be parsed or the
+            balls are invalid
+    """
+    if len(linha) <= max(colunas.values()):
+        raise ValueError(f"expected {max(colunas.values()) + 1} columns, got {len(linha)}")
+
+    concurso = _inteiro(linha[colunas['concurso']])
+    data = _data(linha[colunas['data']])
+    numeros = [_inteiro(linha[colunas[f'n{i}']]) for i in range(1, 7)]
+
+    if concurso < 1:
+        raise ValueError(f"invalid contest id {concurso}")
+    if any(n < 1 or n > 60 for n in numeros):
+        raise ValueError(f"balls out of range 1-60: {numeros}")
+    if len(set(numeros)) != 6:
+        raise ValueError(f"repeated balls: {numeros}")
+
+    return concurso, data, numeros
+
+
+def _parece_concurso(linha: Sequence, colunas: Dict[str, int]) -> bool:
+    """Whether the contest cell holds a number (other rows are layout/continuation rows)."""
+    if len(linha) <= colunas['concurso']:
+        return False
+    try:
+        _inteiro(linha[colunas['concurso']])
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Import
+# ---------------------------------------------------------------------------
+
+def _concursos_existentes(path: Optional[str], carregar) -> Set[int]:
+    if path and os.path.exists(path) and os.path.getsize(path) > 0:
+        return set(carregar(path).concursos.tolist())
+    return set()
+
+
+def _escrever_csv(path: str, lote: List):
+    novo = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, 'a', encoding='utf-8', newline='') as f:
+        escritor = csv.writer(f, delimiter=';', lineterminator='\r\n')
+        if novo:
+            escritor.writerow(CABECALHO_CSV)
+        escritor.writerows(
+            [concurso, data.isoformat()] + numeros for concurso, data, numeros in lote
+        )
+
+
+def _escrever_binario(path: str, lote: List):
+    write_binary(
+        path,
+        np.array([c for c, _, _ in lote], dtype=np.int32),
+        to_ordinals([d.isoformat() for _, d, _ in lote]),
+        np.array([n for _, _, n in lote], dtype=np.uint8)
+    )
+
+
+def import_file(origem: str, csv_path: Optional[str] = None, binario_path: Optional[str] = None,
+                formato: Optional[str] = None, encoding: str = 'utf-8-sig',
+                simular: bool = False, tamanho_lote: int = TAMANHO_LOTE) -> RelatorioImportacao:
+    """
+    Import an official result export.
+
+    Contests already present in a target (or earlier in the same file) are
+    skipped for that target; the report counts them per target. Invalid
+    rows (including truncated ones) are counted and the first ones reported;
+    they never stop the import.
+
+    Args:
+        origem: CSV, XLSX or HTML file to read
+        csv_path: Results CSV to append to (defaults to settings.DATA_PATH)
+        binario_path: Optional binary draw file to append to
+        formato: 'csv', 'xlsx' or 'html' (guessed from the extension if omitted)
+        encoding: Text encoding of CSV/HTML files
+        simular: Validate only, without writing anything
+        tamanho_lote: Rows buffered before each write
+
+    Returns:
+        Import report
+
+    Raises:
+        ErroImportacao: If the format is unknown or no header row is found
+    """
+    csv_path = csv_path or settings.DATA_PATH
+    destinos = [(csv_path, _escrever_csv, _concursos_existentes(csv_path, DrawStore.from_csv))]
+    if binario_path:
+        destinos.append((
+            binario_path, _escrever_binario,
+            _concursos_existentes(binario_path, DrawStore.from_binary)
+        ))
+
+    relatorio = RelatorioImportacao(
+        destinos={path: {'inseridos': 0, 'existentes': 0} for path, _, _ in destinos}
+    )
+    colunas = None
+    vistos: Set[int] = set()
+    lote: List = []
+    inicio = time.perf_counter()
+
+    def gravar():
+        if not simular:
+            for path, escrever, existentes in destinos:
+                novos = [linha for linha in lote if linha[0] not in existentes]
+                if novos:
+                    escrever(path, novos)
+                    existentes.update(linha[0] for linha in novos)
+        lote.clear()
+
+    for numero_linha, linha in enumerate(read_rows(origem, formato, encoding), 1):
+        relatorio.linhas_lidas += 1
+        if colunas is None:
+            # Everything up to the header row (titles, blank lines) is skipped
+            colunas = _mapear_colunas(linha)
+            relatorio.ignorados += 1
+            continue
+
+        if not _parece_concurso(linha, colunas):
+            relatorio.ignorados += 1
+            continue
+
+        try:
+            registro = normalize_row(linha, colunas)
+        except (TypeError, ValueError) as e:
+            relatorio.invalidos += 1
+            if len(relatorio.erros) < MAX_ERROS_DETALHADOS:
+                relatorio.erros.append(f"row {numero_linha}: {e}")
+            continue
+
+        concurso = registro[0]
+        if concurso in vistos:
+            relatorio.duplicados += 1
+            continue
+        vistos.add(concurso)
+
+        for path, _, existentes in destinos:
+            relatorio.destinos[path]['existentes' if concurso in existentes else 'inseridos'] += 1
+        if all(concurso in existentes for _, _, existentes in destinos):
+            relatorio.duplicados += 1
+            continue
+
+        relatorio.importados += 1
+        lote.append(registro)
+        if len(lote) >= tamanho_lote:
+            gravar()
+
+    if colunas is None:
+        raise ErroImportacao(
+            f"No header row with contest, date and six ball columns found in {origem}"
+        )
+
+    gravar()
+    relatorio.duracao_s = time.perf_counter() - inicio
+
+    logger.info(
+        f"Imported {relatorio.importados} contests from {origem} "
+        f"({relatorio.linhas_lidas} rows, {relatorio.linhas_por_segundo:.0f} rows/s)"
+    )
+    return relatorio
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Import official Mega-Sena result exports")
+    parser.add_argument('arquivo', help="CSV, XLSX or HTML export to import")
+    parser.add_argument('--formato', choices=['csv', 'xlsx', 'html'],
+                        help="File format (default: from the extension)")
+    parser.add_argument('--csv', default=settings.DATA_PATH, help="Results CSV to append to")
+    parser.add_argument('--binario', help="Binary draw file to append to")
+    parser.add_argument('--encoding', default='utf-8-sig', help="Text encoding of CSV/HTML files")
+    parser.add_argument('--simular', action='store_true', help="Validate only, write nothing")
+    args = parser.parse_args(argv)
+
+    try:
+        relatorio = import_file(
+            args.arquivo, csv_path=args.csv, binario_path=args.binario,
+            formato=args.formato, encoding=args.encoding, simular=args.simular
+        )
+    except (ErroImportacao, OSError) as e:
+        print(f"Import failed: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Rows read:   {relatorio.linhas_lidas} ({relatorio.ignorados} skipped)")
+    print(f"Imported:    {relatorio.importados}{' (dry run)' if args.simular else ''}")
+    for path, contagem in relatorio.destinos.items():
+        print(f"  {path}: {contagem['inseridos']} inserted, {contagem['existentes']} already present")
+    print(f"Duplicates:  {relatorio.duplicados}")
+    print(f"Invalid:     {relatorio.invalidos}")
+    for erro in relatorio.erros:
+        print(f"  - {erro}")
+    print(f"Throughput:  {relatorio.linhas_por_segundo:.0f} rows/s ({relatorio.duracao_s:.2f} s)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,373 @@
+"""
+Background job system for heavy analyses
+
+Jobs are persisted in a local SQLite table (no external broker) and executed
+on a bounded process pool. Workers write progress and results straight to the
+table, so status queries never touch the pool. Results are deduplicated by a
+hash of the job type, parameters and dataset version.
+
+Each worker loads its own engine from the data file, which may have been
+changed (e.g. by the importer) after the server loaded it. Jobs carry the
+server's dataset version; a worker at another version reloads the file, and
+the version it actually used is stored with the result.
+"""
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Optional
+
+from admission import AdmissaoRecusada
+
+logger = logging.getLogger(__name__)
+
+
+PENDENTE = 'pendente'
+EXECUTANDO = 'executando'
+CONCLUIDO = 'concluido'
+ERRO = 'erro'
+CANCELADO = 'cancelado'
+
+# Jobs in these states are reused when an identical job is submitted
+STATUS_REAPROVEITAVEIS = (PENDENTE, EXECUTANDO, CONCLUIDO)
+
+# Minimum interval between progress writes from a worker (seconds)
+INTERVALO_PROGRESSO = 0.5
+
+
+class JobCancelado(Exception):
+    """Raised inside a worker when its job has been cancelled."""
+
+
+class JobStore:
+    """SQLite-backed job table. Safe to use from several processes."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    tipo TEXT NOT NULL,
+                    parametros TEXT NOT NULL,
+                    params_hash TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progresso REAL NOT NULL DEFAULT 0,
+                    resultado TEXT,
+                    erro TEXT,
+                    versao_dados TEXT,
+                    criado_em REAL NOT NULL,
+                    atualizado_em REAL NOT NULL
+                )
+            """)
+            # Tables created before versao_dados was recorded
+            colunas = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if 'versao_dados' not in colunas:
+                conn.execute("ALTER TABLE jobs ADD COLUMN versao_dados TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_hash ON jobs (params_hash)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def create(self, tipo: str, parametros: Dict, params_hash: str, versao_dados: str) -> str:
+        """Insert a new pending job and return its id."""
+        job_id = uuid.uuid4().hex
+        agora = time.time()
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, tipo, parametros, params_hash, status, versao_dados, "
+                "criado_em, atualizado_em) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, tipo, json.dumps(parametros), params_hash, PENDENTE, versao_dados,
+                 agora, agora)
+            )
+
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Return a job row as a dict (without the result payload)."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, tipo, parametros, status, progresso, erro, versao_dados, "
+                "criado_em, atualizado_em "
+                "FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        job = dict(row)
+        job['parametros'] = json.loads(job['parametros'])
+        return job
+
+    def get_result(self, job_id: str) -> Optional[Dict]:
+        """Return the stored result of a job, if any."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT resultado FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+        if row is None or row['resultado'] is None:
+            return None
+        return json.loads(row['resultado'])
+
+    def find_reusable(self, params_hash: str) -> Optional[str]:
+        """Return the id of the latest pending, running or finished job with this hash."""
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT id FROM jobs WHERE params_hash = ? AND status IN "
+                f"({', '.join('?' * len(STATUS_REAPROVEITAVEIS))}) "
+                f"ORDER BY criado_em DESC LIMIT 1",
+                (params_hash, *STATUS_REAPROVEITAVEIS)
+            ).fetchone()
+
+        return row['id'] if row else None
+
+    def status(self, job_id: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row['status'] if row else None
+
+    def _update(self, job_id: str, condicao: str = "", **campos) -> bool:
+        campos['atualizado_em'] = time.time()
+        atribuicoes = ', '.join(f"{campo} = ?" for campo in campos)
+
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"UPDATE jobs SET {atribuicoes} WHERE id = ? {condicao}",
+                (*campos.values(), job_id)
+            )
+        return cursor.rowcount > 0
+
+    def mark_running(self, job_id: str) -> bool:
+        """Move a pending job to running. Returns False if it was cancelled meanwhile."""
+        return self._update(job_id, f"AND status = '{PENDENTE}'", status=EXECUTANDO)
+
+    def set_progress(self, job_id: str, progresso: float):
+        self._update(job_id, f"AND status = '{EXECUTANDO}'", progresso=progresso)
+
+    def finish(self, job_id: str, resultado: Dict, params_hash: str, versao_dados: str):
+        """Store the result under the hash of the dataset version it was computed on."""
+        self._update(
+            job_id, f"AND status = '{EXECUTANDO}'",
+            status=CONCLUIDO, progresso=1.0, resultado=json.dumps(resultado),
+            params_hash=params_hash, versao_dados=versao_dados
+        )
+
+    def fail(self, job_id: str, erro: str):
+        self._update(job_id, f"AND status IN ('{PENDENTE}', '{EXECUTANDO}')", status=ERRO, erro=erro)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a pending or running job. Returns False if it already ended."""
+        return self._update(
+            job_id, f"AND status IN ('{PENDENTE}', '{EXECUTANDO}')", status=CANCELADO
+        )
+
+    def fail_interrupted(self) -> int:
+        """Mark jobs left pending/running by a previous server process as failed."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, erro = ?, atualizado_em = ? WHERE status IN (?, ?)",
+                (ERRO, "Interrupted by server restart", time.time(), PENDENTE, EXECUTANDO)
+            )
+        return cursor.rowcount
+
+
+# Worker process state (one engine per process, built by the pool initializer)
+_worker_engine = None
+_worker_data_path = None
+# Modification time of the data file when _worker_engine loaded it
+_worker_mtime = None
+
+
+def _init_worker(data_path: str):
+    global _worker_data_path
+    _worker_data_path = data_path
+    _load_worker_engine()
+
+
+def _load_worker_engine():
+    global _worker_engine, _worker_mtime
+    from fuzzy_engine import FuzzyMegaSenaEngine
+    _worker_mtime = os.path.getmtime(_worker_data_path)
+    _worker_engine = FuzzyMegaSenaEngine(data_path=_worker_data_path)
+
+
+def _engine_for(versao_dados: str):
+    """
+    Worker engine for a job submitted at ``versao_dados``.
+
+    Reloads the data file when the engine is at another version and the file
+    changed since it was loaded. The returned engine may still be at another
+    version (the server has not caught up with the file yet).
+    """
+    if (_worker_engine.versao_dados != versao_dados
+            and os.path.getmtime(_worker_data_path) != _worker_mtime):
+        logger.info(f"Reloading worker data: job expects version {versao_dados}, "
+                    f"worker has {_worker_engine.versao_dados}")
+        _load_worker_engine()
+    return _worker_engine
+
+
+def _run_job(db_path: str, job_id: str, tipo: str, parametros: Dict, versao_dados: str):
+    """Execute one job inside a worker process."""
+    from analyses import ANALYSES
+
+    store = JobStore(db_path)
+    if not store.mark_running(job_id):
+        return
+
+    ultima_escrita = 0.0
+
+    def progresso(fracao: float):
+        nonlocal ultima_escrita
+        agora = time.monotonic()
+        if agora - ultima_escrita < INTERVALO_PROGRESSO:
+            return
+        ultima_escrita = agora
+
+        if store.status(job_id) == CANCELADO:
+            raise JobCancelado()
+        store.set_progress(job_id, round(min(max(fracao, 0.0), 1.0), 4))
+
+    try:
+        engine = _engine_for(versao_dados)
+        resultado = ANALYSES[tipo](engine, parametros, progresso)
+        store.finish(
+            job_id, resultado,
+            params_hash(tipo, parametros, engine.versao_dados), engine.versao_dados
+        )
+    except JobCancelado:
+        pass
+    except Exception as e:
+        store.fail(job_id, str(e))
+
+
+def params_hash(tipo: str, parametros: Dict, versao_dados: str) -> str:
+    """Stable hash identifying a job's inputs."""
+    chave = json.dumps(
+        {'tipo': tipo, 'parametros': parametros, 'versao_dados': versao_dados},
+        sort_keys=True
+    )
+    return hashlib.sha256(chave.encode('utf-8')).hexdigest()
+
+
+class JobManager:
+    """Submits jobs to a bounded process pool and tracks them in a JobStore."""
+
+    def __init__(self, db_path: str, data_path: str, max_workers: int = 2,
+                 max_ativos: int = 20, retry_after: int = 30):
+        """
+        Args:
+            db_path: SQLite job table
+            data_path: Results CSV loaded by each worker
+            max_workers: Worker processes
+            max_ativos: Pending plus running jobs accepted at once
+            retry_after: Retry-After (seconds) sent when the queue is full
+        """
+        self.store = JobStore(db_path)
+        self.db_path = db_path
+        self.max_ativos = max_ativos
+        self.retry_after = retry_after
+        self.rejeitados = 0
+
+        interrompidos = self.store.fail_interrupted()
+        if interrompidos:
+            logger.warning(f"Marked {interrompidos} interrupted job(s) as failed")
+
+        # spawn: workers must not inherit the server's threads and sockets
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(data_path,)
+        )
+        self._futures: Dict[str, Future] = {}
+
+    def submit(self, tipo: str, parametros: Dict, versao_dados: str) -> Dict:
+        """
+        Submit a job, or return an identical pending/running/finished one.
+
+        Args:
+            tipo: Analysis type (key of ``analyses.ANALYSES``)
+            parametros: Validated, fully populated parameters
+            versao_dados: Dataset version, so new draws invalidate old results
+
+        Returns:
+            Job dict with an extra ``reaproveitado`` flag
+
+        Raises:
+            AdmissaoRecusada: If a new job is needed and ``max_ativos`` jobs
+                are already pending or running
+        """
+        hash_ = params_hash(tipo, parametros, versao_dados)
+
+        existente = self.store.find_reusable(hash_)
+        if existente is not None:
+            job = self.store.get(existente)
+            job['reaproveitado'] = True
+            return job
+
+        if self.ativos >= self.max_ativos:
+            self.rejeitados += 1
+            raise AdmissaoRecusada(
+                f"Job queue is full ({self.max_ativos} pending or running)", 429, self.retry_after
+            )
+
+        job_id = self.store.create(tipo, parametros, hash_, versao_dados)
+        future = self.executor.submit(
+            _run_job, self.db_path, job_id, tipo, parametros, versao_dados
+        )
+        self._futures[job_id] = future
+        future.add_done_callback(lambda f, job_id=job_id: self._on_done(job_id, f))
+
+        job = self.store.get(job_id)
+        job['reaproveitado'] = False
+        return job
+
+    @property
+    def ativos(self) -> int:
+        """Jobs submitted by this process that are pending or running."""
+        return len(self._futures)
+
+    def metrics(self) -> Dict:
+        """Queue load and rejections since startup."""
+        return {
+            'ativos': self.ativos,
+            'max_ativos': self.max_ativos,
+            'rejeitados': self.rejeitados
+        }
+
+    def _on_done(self, job_id: str, future: Future):
+        self._futures.pop(job_id, None)
+        if not future.cancelled() and future.exception() is not None:
+            # Worker crashed before it could record the failure itself
+            self.store.fail(job_id, str(future.exception()))
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        return self.store.get(job_id)
+
+    def get_result(self, job_id: str) -> Optional[Dict]:
+        return self.store.get_result(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job. Running jobs stop at their next progress report."""
+        cancelado = self.store.cancel(job_id)
+
+        future = self._futures.get(job_id)
+        if cancelado and future is not None:
+            future.cancel()
+
+        return cancelado
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
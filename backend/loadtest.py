@@ -0,0 +1,324 @@
+"""
+Load-testing harness for the Fuzzy Mega-Sena API
+
+Drives POST /api/calcular with slider-drag weight patterns around
+DEFAULT_WEIGHTS at a configurable concurrency and reports throughput,
+latency percentiles and error rate.
+
+Usage (from the backend directory):
+
+    # Start a local uvicorn instance of app:app and run for 30 s
+    python loadtest.py --concorrencia 8 --duracao 30
+
+    # Run against an already running server
+    python loadtest.py --url http://localhost:8000
+
+    # Regression mode: fail (exit code 1) if the thresholds in the
+    # config file are crossed
+    python loadtest.py --verificar loadtest_slo.json
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import settings
+
+
+@dataclass
+class Resultado:
+    """Outcome of a single request."""
+    latencia: float
+    ok: bool
+    codigo: str = ''
+
+
+@dataclass
+class Relatorio:
+    """Aggregated load-test results."""
+    requisicoes: int
+    erros: int
+    duracao_s: float
+    throughput_rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    concorrencia: int
+    status: Dict[str, int] = field(default_factory=dict)
+    # Requests shed by admission control (429/503) and latency of the admitted ones
+    rejeitadas: int = 0
+    p99_admitidas_ms: float = 0.0
+
+    @property
+    def taxa_erro(self) -> float:
+        return self.erros / self.requisicoes if self.requisicoes else 0.0
+
+    def to_dict(self) -> Dict:
+        dados = dict(self.__dict__)
+        dados['taxa_erro'] = self.taxa_erro
+        return dados
+
+
+class SliderSession:
+    """
+    Generates weights the way a user drags the sliders.
+
+    Starts at DEFAULT_WEIGHTS, picks one slider at a time and moves it in
+    small steps in one direction (one request per step), then releases it
+    and moves to another slider.
+    """
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.pesos = dict(settings.DEFAULT_WEIGHTS)
+        self._variavel = None
+        self._passos_restantes = 0
+        self._direcao = 1
+
+    def next_payload(self) -> Dict:
+        if self._passos_restantes == 0:
+            self._variavel = self.rng.choice(list(self.pesos))
+            self._passos_restantes = self.rng.randint(3, 20)
+            # Drift back towards the default when far from it
+            desvio = self.pesos[self._variavel] - settings.DEFAULT_WEIGHTS[self._variavel]
+            self._direcao = -1 if self.rng.random() < 0.5 + desvio / 200 else 1
+
+        passo = self._direcao * self.rng.randint(1, 5)
+        self.pesos[self._variavel] = min(100, max(0, self.pesos[self._variavel] + passo))
+        self._passos_restantes -= 1
+
+        return {
+            'pesos': dict(self.pesos),
+            'quantidade_principal': 6,
+            'quantidade_pool': 12
+        }
+
+
+def _worker(url: urllib.parse.ParseResult, fim: float, limite: Optional[int],
+            contador: List[int], trava: threading.Lock, resultados: List[Resultado],
+            status: Dict[str, int], seed: int):
+    """Send requests over one keep-alive connection until time or count runs out."""
+    sessao = SliderSession(random.Random(seed))
+    conexao = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=60)
+    cabecalhos = {'Content-Type': 'application/json'}
+
+    while time.monotonic() < fim:
+        with trava:
+            if limite is not None and contador[0] >= limite:
+                break
+            contador[0] += 1
+
+        corpo = json.dumps(sessao.next_payload())
+        inicio = time.perf_counter()
+        try:
+            conexao.request('POST', '/api/calcular', body=corpo, headers=cabecalhos)
+            resposta = conexao.getresponse()
+            dados = resposta.read()
+            ok = resposta.status == 200 and json.loads(dados).get('success', False)
+            codigo = str(resposta.status)
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            ok = False
+            codigo = type(e).__name__
+            conexao.close()
+            conexao = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=60)
+        latencia = time.perf_counter() - inicio
+
+        with trava:
+            resultados.append(Resultado(latencia=latencia, ok=ok, codigo=codigo))
+            status[codigo] = status.get(codigo, 0) + 1
+
+    conexao.close()
+
+
+def run_load(url: str, concorrencia: int, duracao_s: float,
+             requisicoes: Optional[int] = None, seed: int = 0) -> Relatorio:
+    """
+    Run the load test against a server.
+
+    Args:
+        url: Base URL of the API
+        concorrencia: Number of concurrent simulated users
+        duracao_s: Maximum duration in seconds
+        requisicoes: Optional total request limit
+        seed: Seed for the slider-drag generators
+
+    Returns:
+        Aggregated report
+    """
+    alvo = urllib.parse.urlparse(url)
+    resultados: List[Resultado] = []
+    status: Dict[str, int] = {}
+    contador = [0]
+    trava = threading.Lock()
+
+    inicio = time.monotonic()
+    fim = inicio + duracao_s
+    threads = [
+        threading.Thread(
+            target=_worker,
+            args=(alvo, fim, requisicoes, contador, trava, resultados, status, seed + i),
+            daemon=True
+        )
+        for i in range(concorrencia)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duracao = time.monotonic() - inicio
+
+    latencias_ms = np.array([r.latencia for r in resultados]) * 1000
+    erros = sum(1 for r in resultados if not r.ok)
+
+    def percentil(p):
+        return float(np.percentile(latencias_ms, p)) if len(latencias_ms) else 0.0
+
+    rejeitadas = sum(1 for r in resultados if r.codigo in ('429', '503'))
+    admitidas_ms = np.array([r.latencia for r in resultados if r.ok]) * 1000
+
+    return Relatorio(
+        requisicoes=len(resultados),
+        erros=erros,
+        duracao_s=duracao,
+        throughput_rps=(len(resultados) - erros) / duracao if duracao > 0 else 0.0,
+        p50_ms=percentil(50),
+        p95_ms=percentil(95),
+        p99_ms=percentil(99),
+        max_ms=float(latencias_ms.max()) if len(latencias_ms) else 0.0,
+        concorrencia=concorrencia,
+        status=status,
+        rejeitadas=rejeitadas,
+        p99_admitidas_ms=float(np.percentile(admitidas_ms, 99)) if len(admitidas_ms) else 0.0
+    )
+
+
+def check_slo(relatorio: Relatorio, limites: Dict) -> List[str]:
+    """Return the list of violated thresholds (empty when the run passes)."""
+    violacoes = []
+
+    if 'p99_ms_max' in limites and relatorio.p99_ms > limites['p99_ms_max']:
+        violacoes.append(f"p99 {relatorio.p99_ms:.1f} ms > {limites['p99_ms_max']} ms")
+    if 'throughput_min_rps' in limites and relatorio.throughput_rps < limites['throughput_min_rps']:
+        violacoes.append(
+            f"throughput {relatorio.throughput_rps:.2f} req/s < {limites['throughput_min_rps']} req/s"
+        )
+    if 'taxa_erro_max' in limites and relatorio.taxa_erro > limites['taxa_erro_max']:
+        violacoes.append(f"error rate {relatorio.taxa_erro:.2%} > {limites['taxa_erro_max']:.2%}")
+
+    return violacoes
+
+
+class LocalServer:
+    """Context manager running ``uvicorn app:app`` on a local port."""
+
+    def __init__(self, porta: int, timeout: float = 120):
+        self.porta = porta
+        self.timeout = timeout
+        self.processo = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.porta}"
+
+    def __enter__(self) -> 'LocalServer':
+        self.processo = subprocess.Popen(
+            [sys.executable, '-m', 'uvicorn', 'app:app',
+             '--host', '127.0.0.1', '--port', str(self.porta), '--log-level', 'warning'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            env=dict(os.environ, LOG_LEVEL='WARNING')
+        )
+
+        limite = time.monotonic() + self.timeout
+        while time.monotonic() < limite:
+            if self.processo.poll() is not None:
+                raise RuntimeError("uvicorn exited before becoming ready")
+            try:
+                conexao = http.client.HTTPConnection('127.0.0.1', self.porta, timeout=2)
+                conexao.request('GET', '/api/ready')
+                if conexao.getresponse().status == 200:
+                    return self
+            except OSError:
+                pass
+            time.sleep(0.5)
+
+        self.__exit__(None, None, None)
+        raise RuntimeError(f"Server not ready after {self.timeout} s")
+
+    def __exit__(self, *exc):
+        if self.processo is not None and self.processo.poll() is None:
+            self.processo.terminate()
+            try:
+                self.processo.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.processo.kill()
+
+
+def _print_report(relatorio: Relatorio):
+    print(f"Requests:    {relatorio.requisicoes} ({relatorio.erros} errors, {relatorio.taxa_erro:.2%})")
+    print(f"Duration:    {relatorio.duracao_s:.1f} s at concurrency {relatorio.concorrencia}")
+    print(f"Throughput:  {relatorio.throughput_rps:.2f} req/s")
+    print(f"Latency:     p50 {relatorio.p50_ms:.1f} ms | p95 {relatorio.p95_ms:.1f} ms | "
+          f"p99 {relatorio.p99_ms:.1f} ms | max {relatorio.max_ms:.1f} ms")
+    print(f"Admitted:    p99 {relatorio.p99_admitidas_ms:.1f} ms ({relatorio.rejeitadas} shed with 429/503)")
+    print(f"Status:      {relatorio.status}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load test POST /api/calcular")
+    parser.add_argument('--url', help="Target an already running server instead of starting one")
+    parser.add_argument('--porta', type=int, default=8765, help="Port for the local server")
+    parser.add_argument('--concorrencia', type=int, help="Concurrent simulated users (default 8)")
+    parser.add_argument('--duracao', type=float, help="Duration in seconds (default 30)")
+    parser.add_argument('--requisicoes', type=int, help="Stop after this many requests")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--verificar', metavar='CONFIG',
+                        help="Regression mode: JSON file with run profile and thresholds")
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    limites = {}
+    if args.verificar:
+        with open(args.verificar, encoding='utf-8') as f:
+            limites = json.load(f)
+
+    # Command line overrides the profile stored in the config file
+    concorrencia = args.concorrencia or limites.get('concorrencia', 8)
+    duracao = args.duracao or limites.get('duracao_s', 30)
+
+    if args.url:
+        relatorio = run_load(args.url, concorrencia, duracao, args.requisicoes, args.seed)
+    else:
+        with LocalServer(args.porta) as servidor:
+            relatorio = run_load(servidor.url, concorrencia, duracao, args.requisicoes, args.seed)
+
+    if args.json:
+        print(json.dumps(relatorio.to_dict(), indent=2))
+    else:
+        _print_report(relatorio)
+
+    if args.verificar:
+        violacoes = check_slo(relatorio, limites)
+        if violacoes:
+            print("\nSLO FAILED:")
+            for violacao in violacoes:
+                print(f"  - {violacao}")
+            return 1
+        print("\nSLO passed")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,44 +2,89 @@
 Pydantic models for API request/response validation
 """
 
-from pydantic import BaseModel, Field, field_validator
-from typing import Dict, List, Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import Any, Dict, List, Literal, Optional
+from math import comb
+from datetime import date
 
 
 class PesosInput(BaseModel):
     """Input model for fuzzy variable weights."""
     frequencia_historica: float = Field(
-        default=50,
+        default=50.0,
         ge=0,
         le=100,
         description="Weight for historical frequency (0-100%)"
     )
     tempo_ausencia: float = Field(
-        default=50,
+        default=50.0,
         ge=0,
         le=100,
         description="Weight for absence time (0-100%)"
     )
     distribuicao_posicional: float = Field(
-        default=50,
+        default=50.0,
         ge=0,
         le=100,
         description="Weight for positional distribution (0-100%)"
     )
     equilibrio_par_impar: float = Field(
-        default=50,
+        default=50.0,
         ge=0,
         le=100,
         description="Weight for even/odd balance (0-100%)"
     )
     tendencia_soma: float = Field(
-        default=50,
+        default=50.0,
         ge=0,
         le=100,
         description="Weight for sum tendency (0-100%)"
     )
 
 
+# Tens buckets accepted in RestricoesSelecao
+DEZENAS = ['1-10', '11-20', '21-30', '31-40', '41-50', '51-60']
+
+
+class RestricoesSelecao(BaseModel):
+    """Constraints for the optimized selection of the main numbers."""
+    pares_min: int = Field(default=0, ge=0, le=20, description="Minimum even numbers")
+    pares_max: Optional[int] = Field(default=None, ge=0, le=20, description="Maximum even numbers")
+    dezenas_min: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Minimum numbers per tens bucket, keyed '1-10' ... '51-60'"
+    )
+    dezenas_max: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Maximum numbers per tens bucket, keyed '1-10' ... '51-60'"
+    )
+    soma_min: int = Field(default=0, ge=0, description="Minimum sum of the main numbers")
+    soma_max: Optional[int] = Field(default=None, ge=0, description="Maximum sum of the main numbers")
+
+    @field_validator('dezenas_min', 'dezenas_max')
+    @classmethod
+    def validate_buckets(cls, v):
+        """Validate tens bucket keys and counts."""
+        for chave, quantidade in v.items():
+            if chave not in DEZENAS:
+                raise ValueError(f"Unknown tens bucket '{chave}' (expected one of {', '.join(DEZENAS)})")
+            if not 0 <= quantidade <= 10:
+                raise ValueError('Tens bucket counts must be between 0 and 10')
+        return v
+
+    @model_validator(mode='after')
+    def validate_ranges(self):
+        """Validate that every minimum is <= its maximum."""
+        if self.pares_max is not None and self.pares_min > self.pares_max:
+            raise ValueError('pares_min must be <= pares_max')
+        if self.soma_max is not None and self.soma_min > self.soma_max:
+            raise ValueError('soma_min must be <= soma_max')
+        for chave, minimo in self.dezenas_min.items():
+            if minimo > self.dezenas_max.get(chave, 10):
+                raise ValueError(f"dezenas_min['{chave}'] must be <= dezenas_max['{chave}']")
+        return self
+
+
 class CalcularRequest(BaseModel):
     """Request model for calculating fuzzy scores."""
     pesos: PesosInput = Field(
@@ -58,6 +103,64 @@ class CalcularRequest(BaseModel):
         le=30,
         description="Size of extended pool (1-30)"
     )
+    peso_coocorrencia: float = Field(
+        default=0,
+        ge=-1,
+        le=1,
+        description="Pair co-occurrence weight for reranking the extended pool "
+                    "(-1 diversifies, 1 favours affinity, 0 disables)"
+    )
+    modo_inferencia: Literal['auto', 'exata'] = Field(
+        default='auto',
+        description="'auto' answers from the precomputed score surface when it is "
+                    "active, 'exata' always runs fuzzy inference"
+    )
+    meia_vida: Optional[float] = Field(
+        default=None,
+        ge=1,
+        le=4096,
+        description="Half-life in draws for time-decayed frequency and positional "
+                    "distribution (omit to weigh all draws equally)"
+    )
+    incluir_explicacao: bool = Field(
+        default=False,
+        description="Include per-term memberships and per-rule activations in dados_graficos"
+    )
+    concurso_inicio: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="First contest (inclusive) the fuzzy variables are computed from"
+    )
+    concurso_fim: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Last contest (inclusive) the fuzzy variables are computed from"
+    )
+    data_inicio: Optional[date] = Field(
+        default=None,
+        description="First draw date (inclusive) the fuzzy variables are computed from"
+    )
+    data_fim: Optional[date] = Field(
+        default=None,
+        description="Last draw date (inclusive) the fuzzy variables are computed from"
+    )
+    janela_paridade: int = Field(
+        default=20,
+        ge=1,
+        le=5000,
+        description="Last draws of the range used for the even/odd balance"
+    )
+    janela_soma: int = Field(
+        default=50,
+        ge=1,
+        le=5000,
+        description="Last draws of the range used for the sum tendency"
+    )
+    restricoes: Optional[RestricoesSelecao] = Field(
+        default=None,
+        description="Pick the main numbers with the highest total score that meet these "
+                    "constraints, instead of the plain top scores"
+    )
 
     @field_validator('quantidade_pool')
     @classmethod
@@ -67,6 +170,31 @@ class CalcularRequest(BaseModel):
             raise ValueError('Pool size must be >= principal quantity')
         return v
 
+    @property
+    def usa_intervalo(self) -> bool:
+        """Whether a range or non-default windows were requested."""
+        padrao = CalcularRequest.model_fields
+        return (
+            any(getattr(self, campo) is not None
+                for campo in ('concurso_inicio', 'concurso_fim', 'data_inicio', 'data_fim'))
+            or self.janela_paridade != padrao['janela_paridade'].default
+            or self.janela_soma != padrao['janela_soma'].default
+        )
+
+    @model_validator(mode='after')
+    def validate_range(self):
+        """Validate range bounds and their combination with meia_vida."""
+        if (self.concurso_inicio is not None and self.concurso_fim is not None
+                and self.concurso_inicio > self.concurso_fim):
+            raise ValueError('concurso_inicio must be <= concurso_fim')
+        if (self.data_inicio is not None and self.data_fim is not None
+                and self.data_inicio > self.data_fim):
+            raise ValueError('data_inicio must be <= data_fim')
+        if self.meia_vida is not None and self.usa_intervalo:
+            raise ValueError('meia_vida weighs the whole history and cannot be combined '
+                             'with a range or custom windows')
+        return self
+
 
 class NumeroScore(BaseModel):
     """Model for a number with its fuzzy score."""
@@ -95,6 +223,12 @@ class Estatisticas(BaseModel):
     media_score: float = Field(description="Average score")
     desvio_padrao: float = Field(description="Standard deviation of scores")
     distribuicao_dezenas: Dict[str, int] = Field(description="Distribution by tens")
+    percentis: Optional[Dict[str, float]] = Field(
+        default=None,
+        description="Percentile (0-100) of soma_total, pares, max_por_dezena and "
+                    "dezenas_ocupadas among uniformly random sets of the same size "
+                    "(absent while the baseline is being built)"
+    )
 
 
 class DistribuicaoScores(BaseModel):
@@ -106,10 +240,31 @@ class DistribuicaoScores(BaseModel):
     alto: int = Field(description="Count of high scores (8-10)")
 
 
+class MatrizCompacta(BaseModel):
+    """Dense matrix as its shape plus row-major values."""
+    forma: List[int] = Field(description="Shape (rows, columns)")
+    valores: List[float] = Field(description="Row-major values")
+
+
+class Explicacao(BaseModel):
+    """Intermediate inference values behind the scores."""
+    numeros: List[int] = Field(description="Number of each matrix row")
+    termos: List[str] = Field(description="Input terms, as 'variable[term]' (pertinencias columns)")
+    regras: List[str] = Field(description="Rules (ativacoes columns)")
+    termos_saida: List[str] = Field(description="Output terms (cortes columns)")
+    pertinencias: MatrizCompacta = Field(description="Membership degree of each number in each input term")
+    ativacoes: MatrizCompacta = Field(description="Firing strength of each rule for each number")
+    cortes: MatrizCompacta = Field(description="Aggregated activation of each output term for each number")
+
+
 class DadosGraficos(BaseModel):
     """Data for charts and visualizations."""
     todos_scores: List[NumeroScore] = Field(description="Scores for all 60 numbers")
     distribuicao_scores: DistribuicaoScores = Field(description="Score distribution")
+    explicacao: Optional[Explicacao] = Field(
+        default=None,
+        description="Memberships and rule activations (when requested)"
+    )
 
 
 class CalcularResponse(BaseModel):
@@ -125,6 +280,14 @@ class ResultadosData(BaseModel):
     pool_estendido: List[int] = Field(description="Extended pool of numbers")
     estatisticas: Estatisticas = Field(description="Statistics about results")
     dados_graficos: DadosGraficos = Field(description="Data for charts")
+    modo_inferencia: Literal['superficie', 'exata'] = Field(
+        default='exata',
+        description="How the scores were computed"
+    )
+    modo_selecao: Literal['top', 'otimizada'] = Field(
+        default='top',
+        description="How the main numbers were picked: top scores or constrained optimization"
+    )
 
 
 class ConfiguracaoPadrao(BaseModel):
@@ -141,11 +304,179 @@ class DadosHistoricos(BaseModel):
     total_numeros: int = Field(default=60, description="Total numbers in the game")
 
 
+class ParCoocorrencia(BaseModel):
+    """Group of numbers with its co-occurrence count."""
+    numeros: List[int] = Field(description="Numbers in the group")
+    contagem: int = Field(description="Number of draws containing all of them")
+    lift: Optional[float] = Field(
+        default=None,
+        description="Observed / expected count under uniform draws (pairs only)"
+    )
+
+
+class CoocorrenciaResponse(BaseModel):
+    """Co-occurrence statistics response model."""
+    total_concursos: int = Field(description="Number of draws counted")
+    esperado_par: float = Field(description="Expected count for any pair")
+    top_pares: List[ParCoocorrencia] = Field(description="Most frequent pairs")
+    top_triplets: List[ParCoocorrencia] = Field(
+        default_factory=list,
+        description="Most frequent triplets (empty if disabled)"
+    )
+    parceiros: Optional[List[ParCoocorrencia]] = Field(
+        default=None,
+        description="Most frequent partners of the requested number"
+    )
+    matriz: Optional[List[List[int]]] = Field(
+        default=None,
+        description="Full 60x60 pair count matrix (diagonal = frequency)"
+    )
+
+
+VariavelFuzzy = Literal[
+    'frequencia_historica', 'tempo_ausencia', 'distribuicao_posicional',
+    'equilibrio_par_impar', 'tendencia_soma'
+]
+
+# Upper bound on tickets a single enumeration job may generate
+MAX_BILHETES_ENUMERACAO = 5_000_000
+
+
+class VarreduraParametros(BaseModel):
+    """Parameters for a weight sweep job."""
+    pesos: PesosInput = Field(default_factory=PesosInput, description="Base weights")
+    variaveis: List[VariavelFuzzy] = Field(
+        default_factory=lambda: list(VariavelFuzzy.__args__),
+        min_length=1,
+        description="Variables to sweep from 0 to 100"
+    )
+    passos: int = Field(default=11, ge=2, le=101, description="Points per variable")
+    quantidade_principal: int = Field(default=6, ge=1, le=20, description="Main recommendations per point")
+
+
+class BacktestParametros(BaseModel):
+    """Parameters for a walk-forward backtest job."""
+    pesos: PesosInput = Field(default_factory=PesosInput, description="Weights for each variable")
+    quantidade_principal: int = Field(default=6, ge=1, le=20, description="Numbers picked per contest")
+    concursos: int = Field(default=50, ge=1, le=1000, description="Most recent contests to test")
+
+
+class EnumeracaoParametros(BaseModel):
+    """Parameters for a full ticket enumeration job."""
+    pesos: PesosInput = Field(default_factory=PesosInput, description="Weights for each variable")
+    quantidade_pool: int = Field(default=20, ge=6, le=30, description="Pool size to enumerate from")
+    tamanho_bilhete: int = Field(default=6, ge=6, le=15, description="Numbers per ticket")
+    top_k: int = Field(default=100, ge=1, le=1000, description="Best tickets to return")
+
+    @model_validator(mode='after')
+    def limit_ticket_count(self):
+        """Validate ticket size and total number of combinations."""
+        if self.tamanho_bilhete > self.quantidade_pool:
+            raise ValueError('Ticket size must be <= pool size')
+        if comb(self.quantidade_pool, self.tamanho_bilhete) > MAX_BILHETES_ENUMERACAO:
+            raise ValueError(f'Enumeration limited to {MAX_BILHETES_ENUMERACAO} tickets')
+        return self
+
+
+class JobRequest(BaseModel):
+    """Request model for submitting a background job."""
+    tipo: Literal['varredura', 'backtest', 'enumeracao'] = Field(description="Analysis type")
+    parametros: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Analysis parameters (see VarreduraParametros, BacktestParametros, EnumeracaoParametros)"
+    )
+
+
+class JobResponse(BaseModel):
+    """Background job status model."""
+    id: str = Field(description="Job id")
+    tipo: str = Field(description="Analysis type")
+    status: Literal['pendente', 'executando', 'concluido', 'erro', 'cancelado'] = Field(
+        description="Job status"
+    )
+    progresso: float = Field(ge=0, le=1, description="Progress (0-1)")
+    parametros: Dict[str, Any] = Field(description="Validated parameters")
+    erro: Optional[str] = Field(default=None, description="Error message if any")
+    versao_dados: Optional[str] = Field(
+        default=None,
+        description="Dataset version (draw count:last contest) the job was submitted at, "
+                    "replaced on completion by the version the result was computed on"
+    )
+    criado_em: float = Field(description="Creation time (Unix timestamp)")
+    atualizado_em: float = Field(description="Last update time (Unix timestamp)")
+    reaproveitado: bool = Field(
+        default=False,
+        description="Whether an identical existing job was returned"
+    )
+
+
+class JobResultadoResponse(BaseModel):
+    """Background job result model."""
+    id: str = Field(description="Job id")
+    tipo: str = Field(description="Analysis type")
+    resultado: Dict[str, Any] = Field(description="Analysis result")
+
+
+class SuperficieResponse(BaseModel):
+    """Score surface status model."""
+    ativa: bool = Field(description="Whether requests in 'auto' mode use the surface")
+    pontos_grade: int = Field(description="Grid points per weight axis")
+    orcamento_erro: float = Field(description="Maximum accepted score error")
+    erro_maximo: float = Field(
+        description="Maximum error measured against exact inference, with flagged cells computed exactly"
+    )
+    erro_interpolacao: float = Field(description="Maximum error of plain interpolation")
+    fracao_exata: float = Field(description="Fraction of (cell, number) pairs always computed exactly")
+    amostras_validacao: int = Field(description="Random weight vectors used for validation")
+    bytes: int = Field(description="Memory used by the surface")
+    tempo_construcao_s: float = Field(description="Build time in seconds")
+
+
 class HealthResponse(BaseModel):
     """Health check response model."""
     status: str = Field(default="ok", description="Service status")
     version: str = Field(default="1.0.0", description="API version")
 
 
+class ReadinessResponse(BaseModel):
+    """Readiness check response model."""
+    status: Literal['iniciando', 'pronto', 'erro'] = Field(description="Startup status")
+    etapa: Optional[str] = Field(default=None, description="Startup step in progress")
+    decorrido_s: float = Field(description="Seconds since startup began (total time once finished)")
+    erro: Optional[str] = Field(default=None, description="Error message if startup failed")
+    indisponiveis: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Optional startup steps that failed (features unavailable), with their error"
+    )
+
+
+class LimitadorMetricas(BaseModel):
+    """Admission metrics of one limited endpoint."""
+    concorrencia: int = Field(description="Concurrent executions allowed")
+    tamanho_fila: int = Field(description="Requests allowed to wait for a slot")
+    em_execucao: int = Field(description="Requests running now")
+    na_fila: int = Field(description="Requests waiting now")
+    pico_fila: int = Field(description="Largest queue depth since startup")
+    admitidas: int = Field(description="Admitted requests since startup")
+    rejeitadas_fila_cheia: int = Field(description="Rejected at once because the queue was full (429)")
+    rejeitadas_espera: int = Field(description="Rejected after waiting too long for a slot (503)")
+    espera_media_ms: float = Field(
+        description="Mean queue wait of admitted requests (requests that found a free slot count as 0)"
+    )
+
+
+class JobsMetricas(BaseModel):
+    """Background job queue metrics."""
+    ativos: int = Field(description="Pending or running jobs")
+    max_ativos: int = Field(description="Pending or running jobs allowed")
+    rejeitados: int = Field(description="Submissions rejected since startup (429)")
+
+
+class AdmissaoMetricasResponse(BaseModel):
+    """Admission control metrics response model."""
+    limitadores: Dict[str, LimitadorMetricas] = Field(description="Metrics per limited endpoint")
+    jobs: Optional[JobsMetricas] = Field(default=None, description="Background job queue")
+
+
 # Update forward references
 CalcularResponse.model_rebuild()
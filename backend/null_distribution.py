@@ -0,0 +1,199 @@
+"""
+Monte Carlo null distributions for recommendation statistics
+
+Simulates uniform random draws to give ``estatisticas`` a baseline: for a
+set of ``top_n`` numbers picked uniformly from 1-60, how are the sum, the
+even count and the spread over the tens distributed? A recommended set can
+then be reported as percentiles of those distributions.
+
+Each simulated row is a random ordering of 1-60; its first k numbers are a
+uniform k-subset for every k at once, so a single run covers every
+``top_n`` up to ``MAX_TOP_N``. Rows are generated in chunks with one
+seeded generator per chunk, and the per-chunk histograms are summed, so
+results do not depend on the number of worker processes.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+# Largest recommendation size covered (CalcularRequest.quantidade_principal)
+MAX_TOP_N = 20
+
+# Simulated rows per chunk
+TAMANHO_LOTE = 50_000
+
+# Worker processes used when one per CPU is requested (each peaks around 150 MB)
+MAX_WORKERS = 4
+
+# Histogram size of each statistic (values 0 .. bins - 1)
+BINS = {
+    'soma_total': sum(range(60 - MAX_TOP_N + 1, 61)) + 1,
+    'pares': MAX_TOP_N + 1,
+    'max_por_dezena': 11,
+    'dezenas_ocupadas': 7,
+}
+
+
+def statistics(numeros: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Statistics of every prefix of each row.
+
+    Args:
+        numeros: (M x K) numbers (1-60)
+
+    Returns:
+        Dict of (M x K) arrays; column k-1 describes the first k numbers
+    """
+    numeros = np.asarray(numeros, dtype=np.int64)
+    dezenas = (numeros - 1) // 10
+    por_dezena = np.cumsum(dezenas[:, :, None] == np.arange(6), axis=1, dtype=np.int16)
+
+    return {
+        'soma_total': np.cumsum(numeros, axis=1),
+        'pares': np.cumsum(numeros % 2 == 0, axis=1),
+        'max_por_dezena': por_dezena.max(axis=2),
+        'dezenas_ocupadas': (por_dezena > 0).sum(axis=2),
+    }
+
+
+def _simular_lote(seed: np.random.SeedSequence, linhas: int) -> Dict[str, np.ndarray]:
+    """Histograms (MAX_TOP_N x bins) of ``linhas`` simulated draws."""
+    rng = np.random.default_rng(seed)
+
+    # First MAX_TOP_N positions of a uniform random permutation of 1-60
+    chaves = rng.random((linhas, 60))
+    indices = np.argpartition(chaves, MAX_TOP_N - 1, axis=1)[:, :MAX_TOP_N]
+    ordem = np.argsort(np.take_along_axis(chaves, indices, axis=1), axis=1)
+    numeros = np.take_along_axis(indices, ordem, axis=1) + 1
+
+    linha_k = np.arange(MAX_TOP_N)
+    histogramas = {}
+    for nome, valores in statistics(numeros).items():
+        bins = BINS[nome]
+        histogramas[nome] = np.bincount(
+            (linha_k * bins + valores).ravel(), minlength=MAX_TOP_N * bins
+        ).reshape(MAX_TOP_N, bins)
+
+    return histogramas
+
+
+class NullDistribution:
+    """Histograms of each statistic for one ``top_n``."""
+
+    def __init__(self, top_n: int, histogramas: Dict[str, np.ndarray]):
+        self.top_n = top_n
+        self.histogramas = histogramas
+        self.amostras = int(next(iter(histogramas.values())).sum())
+
+    def percentile(self, estatistica: str, valor: int) -> float:
+        """
+        Mid-rank percentile (0-100) of ``valor``.
+
+        Counts half of the simulated sets with exactly ``valor``, so the
+        typical value of a discrete statistic sits near 50.
+        """
+        histograma = self.histogramas[estatistica]
+        valor = int(np.clip(valor, 0, len(histograma) - 1))
+        abaixo = histograma[:valor].sum()
+        return float((abaixo + 0.5 * histograma[valor]) / self.amostras * 100)
+
+
+class NullDistributions:
+    """Null distributions for every ``top_n`` from one simulation, cached."""
+
+    def __init__(self, amostras: int = 1_000_000, seed: int = 0, workers: int = 1):
+        """
+        Args:
+            amostras: Simulated draws (> 0)
+            seed: Seed of the generator (same seed, same distributions)
+            workers: Worker processes (1 = in process, 0 = one per CPU up to
+                ``MAX_WORKERS``)
+        """
+        if amostras <= 0:
+            raise ValueError(f"Number of simulated draws must be positive, got {amostras}")
+        if workers < 0:
+            raise ValueError(f"Number of workers must be >= 0, got {workers}")
+
+        self.amostras = amostras
+        self.seed = seed
+        self.workers = workers or min(os.cpu_count() or 1, MAX_WORKERS)
+        self.tempo_construcao_s: Optional[float] = None
+        self._distribuicoes: Dict[int, NullDistribution] = {}
+        self._trava = threading.Lock()
+
+    def build(self) -> 'NullDistributions':
+        """Run the simulation (blocking) and cache the distributions."""
+        inicio = time.perf_counter()
+
+        linhas = [TAMANHO_LOTE] * (self.amostras // TAMANHO_LOTE)
+        if self.amostras % TAMANHO_LOTE:
+            linhas.append(self.amostras % TAMANHO_LOTE)
+        seeds = np.random.SeedSequence(self.seed).spawn(len(linhas))
+
+        if self.workers == 1 or len(linhas) == 1:
+            lotes = map(_simular_lote, seeds, linhas)
+            totais = _somar(lotes)
+        else:
+            with ProcessPoolExecutor(
+                max_workers=min(self.workers, len(linhas)),
+                mp_context=multiprocessing.get_context('spawn')
+            ) as executor:
+                totais = _somar(executor.map(_simular_lote, seeds, linhas))
+
+        distribuicoes = {
+            k: NullDistribution(k, {nome: h[k - 1] for nome, h in totais.items()})
+            for k in range(1, MAX_TOP_N + 1)
+        }
+        with self._trava:
+            self._distribuicoes = distribuicoes
+        self.tempo_construcao_s = time.perf_counter() - inicio
+
+        logger.info(
+            f"Null distributions: {self.amostras} simulated draws with {self.workers} "
+            f"worker(s) in {self.tempo_construcao_s:.1f} s"
+        )
+        return self
+
+    def get(self, top_n: int) -> Optional[NullDistribution]:
+        """Cached distribution for ``top_n`` numbers (None if not built yet)."""
+        with self._trava:
+            return self._distribuicoes.get(top_n)
+
+    def percentiles(self, numeros: Sequence[int]) -> Optional[Dict[str, float]]:
+        """
+        Percentiles of a recommended set against the uniform baseline.
+
+        Returns:
+            Percentile of each statistic, or None if the distribution for
+            ``len(numeros)`` is not available
+        """
+        distribuicao = self.get(len(numeros))
+        if distribuicao is None:
+            return None
+
+        valores = statistics(np.array([list(numeros)]))
+        return {
+            nome: distribuicao.percentile(nome, int(valor[0, -1]))
+            for nome, valor in valores.items()
+        }
+
+
+def _somar(lotes) -> Dict[str, np.ndarray]:
+    """Sum per-chunk histograms."""
+    totais: Dict[str, np.ndarray] = {}
+    for lote in lotes:
+        for nome, histograma in lote.items():
+            if nome in totais:
+                totais[nome] += histograma
+            else:
+                totais[nome] = histograma.astype(np.int64)
+    return totais
@@ -0,0 +1,97 @@
+"""
+Constrained selection of the main numbers
+
+Instead of taking the ``top_n`` best scores, picks the ``top_n`` numbers
+with the highest total fuzzy score among the sets that satisfy:
+
+- a range of even numbers
+- a minimum and maximum count per tens bucket (1-10, 11-20, ..., 51-60)
+- a range for the sum of the numbers
+
+This is a 0-1 integer program with one binary per candidate and nine
+linear constraints. It is solved exactly (zero optimality gap) with the
+HiGHS branch-and-bound in ``scipy.optimize.milp``, which also proves
+infeasibility. With 60 candidates it takes a few milliseconds.
+"""
+
+import numpy as np
+from scipy.optimize import Bounds, LinearConstraint, milp
+from typing import List, Optional, Sequence
+
+
+# Wall-clock limit of a single solve (seconds)
+TEMPO_MAXIMO_S = 5.0
+
+
+class RestricoesInviaveis(ValueError):
+    """Raised when no set of numbers satisfies the selection constraints."""
+
+
+class ErroOtimizacao(RuntimeError):
+    """Raised when the solver stops without an optimal set (time limit or solver failure)."""
+
+
+def select_numbers(numeros: Sequence[int], scores: Sequence[float], quantidade: int,
+                   pares_min: int = 0, pares_max: Optional[int] = None,
+                   dezenas_min: Optional[Sequence[int]] = None,
+                   dezenas_max: Optional[Sequence[int]] = None,
+                   soma_min: int = 0, soma_max: Optional[int] = None) -> List[int]:
+    """
+    Highest total score set of ``quantidade`` numbers within the constraints.
+
+    Args:
+        numeros: Candidate numbers (1-60)
+        scores: Score of each candidate
+        quantidade: Numbers to select
+        pares_min: Minimum even numbers
+        pares_max: Maximum even numbers (default: no limit)
+        dezenas_min: Minimum numbers per tens bucket (1-10 first, 51-60 last)
+        dezenas_max: Maximum numbers per tens bucket (1-10 first, 51-60 last)
+        soma_min: Minimum sum of the selected numbers
+        soma_max: Maximum sum of the selected numbers (default: no limit)
+
+    Returns:
+        Selected numbers, best score first
+
+    Raises:
+        RestricoesInviaveis: If the constraints cannot be met
+        ErroOtimizacao: If the solver hits ``TEMPO_MAXIMO_S`` or fails
+    """
+    numeros = np.asarray(numeros, dtype=np.int64)
+    scores = np.asarray(scores, dtype=np.float64)
+    dezenas_min = np.zeros(6) if dezenas_min is None else np.asarray(dezenas_min)
+    dezenas_max = np.full(6, quantidade) if dezenas_max is None else np.asarray(dezenas_max)
+
+    if quantidade > len(numeros):
+        raise RestricoesInviaveis(f"Only {len(numeros)} candidates for {quantidade} numbers")
+
+    # One row per constraint over the candidate indicators
+    linhas = [
+        np.ones(len(numeros)),
+        (numeros % 2 == 0).astype(np.float64),
+        numeros.astype(np.float64),
+    ]
+    minimos = [quantidade, pares_min, soma_min]
+    maximos = [quantidade, quantidade if pares_max is None else pares_max,
+               np.inf if soma_max is None else soma_max]
+    for b in range(6):
+        linhas.append(((numeros - 1) // 10 == b).astype(np.float64))
+        minimos.append(dezenas_min[b])
+        maximos.append(dezenas_max[b])
+
+    resultado = milp(
+        -scores,
+        constraints=LinearConstraint(np.vstack(linhas), minimos, maximos),
+        integrality=np.ones(len(numeros)),
+        bounds=Bounds(0, 1),
+        options={'mip_rel_gap': 0, 'time_limit': TEMPO_MAXIMO_S}
+    )
+
+    if resultado.status == 2:
+        raise RestricoesInviaveis("No set of numbers satisfies the selection constraints")
+    if resultado.status != 0:
+        raise ErroOtimizacao(f"Could not solve the selection constraints: {resultado.message}")
+
+    escolhidos = np.flatnonzero(resultado.x > 0.5)
+    escolhidos = escolhidos[np.argsort(-scores[escolhidos], kind='stable')]
+    return [int(numeros[i]) for i in escolhidos]
@@ -0,0 +1,139 @@
+"""
+Prefix-sum cube of draw statistics
+
+Keeps cumulative arrays over the draw history (oldest first), so the
+statistics behind the fuzzy variables can be read for any contiguous range
+of draws as the difference of two prefixes:
+
+- counts per number and per number and draw position
+- running total of the drawn balls and of the even ones
+- last row (up to each prefix) in which every number was drawn
+
+Any range then costs O(60) (O(360) for positions) instead of a pass over
+the draws it covers. Row ranges are half-open, ``[inicio, fim)``; see
+``DrawStore.rows_between`` to turn contests or dates into rows.
+"""
+
+import numpy as np
+
+from draw_store import reserve_rows
+
+
+# Absence reported for numbers not drawn in the range
+AUSENCIA_NAO_SORTEADO = 999
+
+# Largest count stored as uint16; beyond it counts are widened to int32
+_MAX_UINT16 = np.iinfo(np.uint16).max
+
+
+class PrefixCube:
+    """
+    Cumulative counts indexed by prefix length (row 0 = no draws).
+
+    Memory is about 1.1 KiB per draw while counts fit in uint16 (up to
+    65,535 draws): 2.3 MiB for the bundled history, against 30 KiB for the
+    DrawStore itself. Past that, counts are int32 and it is about 1.9 KiB
+    per draw, e.g. 400 MiB at 100x the bundled history. Built capacity
+    equals the history size; adding draws grows the buffers geometrically
+    (writing in place until they are full), so after additions it can
+    take up to twice those figures.
+    """
+
+    def __init__(self, sorteios: np.ndarray, datas: np.ndarray):
+        """
+        Args:
+            sorteios: (N x 6) balls, oldest draw first
+            datas: Day ordinals of the draws
+        """
+        self._tamanho = 0
+        self._posicoes = np.zeros((1, 60, 6), dtype=np.uint16)
+        self._contagens = np.zeros((1, 60), dtype=np.uint16)
+        self._somas = np.zeros(1, dtype=np.int64)
+        self._pares = np.zeros(1, dtype=np.int64)
+        self._ultima_linha = np.full((1, 60), -1, dtype=np.int32)
+        self._datas = np.zeros(0, dtype=np.int32)
+
+        self.add_draws(sorteios, datas)
+
+    def __len__(self) -> int:
+        return self._tamanho
+
+    def _reservar(self, extra: int):
+        """Make room for ``extra`` more draws, growing geometrically."""
+        necessario = self._tamanho + extra
+        # Prefix arrays hold one more row (the empty prefix) than there are draws
+        for nome, linha_extra in (('_posicoes', 1), ('_contagens', 1), ('_somas', 1),
+                                  ('_pares', 1), ('_ultima_linha', 1), ('_datas', 0)):
+            setattr(self, nome, reserve_rows(
+                getattr(self, nome), necessario + linha_extra, self._tamanho + linha_extra
+            ))
+
+        # A count never exceeds the number of draws
+        if necessario > _MAX_UINT16 and self._posicoes.dtype == np.uint16:
+            self._posicoes = self._posicoes.astype(np.int32)
+            self._contagens = self._contagens.astype(np.int32)
+
+    def add_draws(self, sorteios: np.ndarray, datas: np.ndarray):
+        """
+        Extend the prefixes with new draws (oldest first).
+
+        Draws must be newer than every draw already counted.
+        """
+        sorteios = np.asarray(sorteios, dtype=np.int64).reshape(-1, 6)
+        n = len(sorteios)
+        if n == 0:
+            return
+
+        self._reservar(n)
+        inicio = self._tamanho
+        linhas = np.arange(n)[:, None]
+        # Prefix rows written by this call
+        novas = slice(inicio + 1, inicio + n + 1)
+
+        # One-hot (n x 60 x 6) of every ball, accumulated on top of the last prefix
+        posicoes = self._posicoes[novas]
+        posicoes[...] = 0
+        posicoes[linhas, sorteios - 1, np.arange(6)] = 1
+        np.cumsum(posicoes, axis=0, out=posicoes)
+        posicoes += self._posicoes[inicio]
+        posicoes.sum(axis=2, dtype=self._contagens.dtype, out=self._contagens[novas])
+
+        presentes = np.zeros((n, 60), dtype=bool)
+        presentes[linhas, sorteios - 1] = True
+        np.maximum.accumulate(
+            np.where(presentes, inicio + linhas, -1), axis=0, out=self._ultima_linha[novas]
+        )
+        np.maximum(self._ultima_linha[novas], self._ultima_linha[inicio], out=self._ultima_linha[novas])
+
+        self._somas[novas] = self._somas[inicio] + np.cumsum(sorteios.sum(axis=1))
+        self._pares[novas] = self._pares[inicio] + np.cumsum((sorteios % 2 == 0).sum(axis=1))
+        self._datas[inicio:inicio + n] = datas
+        self._tamanho = inicio + n
+
+    def frequency(self, inicio: int, fim: int) -> np.ndarray:
+        """(60,) appearance counts in rows [inicio, fim)."""
+        return (self._contagens[fim] - self._contagens[inicio]).astype(np.float64)
+
+    def positional_counts(self, inicio: int, fim: int) -> np.ndarray:
+        """(60 x 6) appearance counts per draw position in rows [inicio, fim)."""
+        return (self._posicoes[fim] - self._posicoes[inicio]).astype(np.float64)
+
+    def absence_days(self, inicio: int, fim: int) -> np.ndarray:
+        """
+        (60,) days between the last draw of the range and each number's last
+        appearance in it (``AUSENCIA_NAO_SORTEADO`` when not drawn there).
+        """
+        ultimas = self._ultima_linha[fim]
+        sorteados = ultimas >= inicio
+        dias = self._datas[fim - 1] - self._datas[np.where(sorteados, ultimas, fim - 1)]
+        return np.where(sorteados, dias, AUSENCIA_NAO_SORTEADO).astype(np.int64)
+
+    def even_share(self, inicio: int, fim: int) -> float:
+        """Share of even balls in rows [inicio, fim) (0.5 when empty)."""
+        if fim <= inicio:
+            return 0.5
+        return float(self._pares[fim] - self._pares[inicio]) / (6 * (fim - inicio))
+
+    def mean_sum(self, inicio: int, fim: int) -> float:
+        """Mean sum of the six balls over rows [inicio, fim)."""
+        return float(self._somas[fim] - self._somas[inicio]) / (fim - inicio)
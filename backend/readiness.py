@@ -0,0 +1,121 @@
+"""
+Background initialization with readiness tracking
+
+Runs the startup steps (engine build, cache warm-up, ...) one after the
+other in worker threads, so the server answers liveness checks while they
+run. Request handlers wait for readiness with a bounded timeout.
+
+Only the steps the service cannot work without are fatal; optional steps
+(cache warm-up, background jobs) that fail are logged and reported as
+unavailable, and startup goes on.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+INICIANDO = 'iniciando'
+PRONTO = 'pronto'
+ERRO = 'erro'
+
+
+class Readiness:
+    """Status of the background initialization."""
+
+    def __init__(self):
+        self.status = INICIANDO
+        self.etapa: Optional[str] = None
+        self.erro: Optional[str] = None
+        # Optional steps that failed, with their error
+        self.indisponiveis: Dict[str, str] = {}
+        self._inicio = time.monotonic()
+        self._duracao: Optional[float] = None
+        self._tarefa: Optional[asyncio.Task] = None
+
+    @property
+    def pronto(self) -> bool:
+        return self.status == PRONTO
+
+    def start(self, etapas: List[Tuple[str, Callable[[], None]]],
+              opcionais: Iterable[str] = ()) -> asyncio.Task:
+        """
+        Run ``etapas`` in order, each in a worker thread.
+
+        Must be called from the event loop. A failing required step stops
+        the initialization and leaves the status as ``erro``; a failing
+        optional step is recorded in ``indisponiveis`` and skipped.
+
+        Args:
+            etapas: (name, blocking function) pairs
+            opcionais: Names of the steps whose failure is not fatal
+        """
+        self._inicio = time.monotonic()
+        self._tarefa = asyncio.create_task(self._executar(etapas, set(opcionais)))
+        return self._tarefa
+
+    async def _executar(self, etapas, opcionais):
+        try:
+            for nome, funcao in etapas:
+                self.etapa = nome
+                inicio = time.monotonic()
+                try:
+                    await asyncio.to_thread(_chamar, funcao)
+                except Exception as e:
+                    if nome not in opcionais:
+                        raise
+                    self.indisponiveis[nome] = str(e)
+                    logger.error(f"Optional startup step '{nome}' failed, continuing without it: {e}")
+                    continue
+                logger.info(f"Startup step '{nome}' done in {time.monotonic() - inicio:.1f} s")
+        except Exception as e:
+            self.status = ERRO
+            self.erro = f"{self.etapa}: {e}"
+            logger.error(f"Startup failed at step '{self.etapa}': {e}", exc_info=True)
+        else:
+            self.status = PRONTO
+            self.etapa = None
+            logger.info(f"Ready after {time.monotonic() - self._inicio:.1f} s")
+        finally:
+            self._duracao = time.monotonic() - self._inicio
+
+    async def wait(self, timeout: float) -> bool:
+        """
+        Wait until initialization ends or ``timeout`` seconds pass.
+
+        Returns:
+            Whether the service is ready
+        """
+        if self._tarefa is not None and not self._tarefa.done():
+            try:
+                await asyncio.wait_for(asyncio.shield(self._tarefa), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.pronto
+
+    def summary(self) -> Dict:
+        """Status, current step, elapsed seconds, error and unavailable features."""
+        return {
+            'status': self.status,
+            'etapa': self.etapa,
+            'decorrido_s': self._duracao if self._duracao is not None else time.monotonic() - self._inicio,
+            'erro': self.erro,
+            'indisponiveis': dict(self.indisponiveis)
+        }
+
+
+def _chamar(funcao: Callable[[], None]):
+    """
+    Run a step, turning any exception into a plain error.
+
+    ``asyncio.to_thread`` cannot deliver some exceptions to the awaiting
+    task (a StopIteration leaves it waiting forever), so everything is
+    re-raised as RuntimeError.
+    """
+    try:
+        funcao()
+    except BaseException as e:
+        raise RuntimeError(f"{type(e).__name__}: {e}") from e
@@ -0,0 +1,138 @@
+"""
+Interactive calculation sessions for the WebSocket endpoint
+
+A session keeps the last request and result of one client so that each
+slider update can be answered with only what changed. Updates that arrive
+while a calculation is running are merged into a single pending update, so
+intermediate slider positions are never computed.
+"""
+
+from typing import Dict, List, Optional
+
+from models import CalcularRequest
+
+
+# Score changes smaller than this are not reported
+TOLERANCIA_SCORE = 1e-6
+
+
+class CalculoSession:
+    """State of one interactive calculation session."""
+
+    def __init__(self):
+        self.estado: Dict = CalcularRequest().model_dump()
+        self.ultimo_resultado: Optional[Dict] = None
+        self.ultima_requisicao: Optional[Dict] = None
+        self.pendente: Optional[Dict] = None
+        self.descartadas = 0
+
+    def queue_update(self, mensagem: Dict):
+        """
+        Merge an incoming update into the pending one.
+
+        Later values win; ``pesos`` is merged per variable so partial
+        updates for different sliders are not lost when one is superseded.
+        """
+        if self.pendente is None:
+            self.pendente = {}
+        else:
+            self.descartadas += 1
+
+        for campo, valor in mensagem.items():
+            if campo == 'pesos' and isinstance(valor, dict) and isinstance(self.pendente.get('pesos'), dict):
+                self.pendente['pesos'] = dict(self.pendente['pesos'], **valor)
+            else:
+                self.pendente[campo] = valor
+
+    def take_update(self) -> Optional[Dict]:
+        """Return and clear the pending update."""
+        pendente, self.pendente = self.pendente, None
+        return pendente
+
+    def merge_update(self, mensagem: Dict) -> CalcularRequest:
+        """
+        Apply a (possibly partial) update to the session request.
+
+        Only the given fields change; ``pesos`` is merged per variable so a
+        slider drag can send just the weight being moved.
+
+        Raises:
+            pydantic.ValidationError: If the resulting request is invalid
+        """
+        estado = dict(self.estado)
+        for campo, valor in mensagem.items():
+            if campo == 'pesos' and isinstance(valor, dict):
+                estado['pesos'] = dict(estado['pesos'], **valor)
+            elif campo in estado:
+                estado[campo] = valor
+
+        request = CalcularRequest(**estado)
+        self.estado = request.model_dump()
+        return request
+
+    def is_unchanged(self, request: CalcularRequest) -> bool:
+        """Whether ``request`` equals the last computed one."""
+        return self.ultima_requisicao == request.model_dump()
+
+    def delta(self, request: CalcularRequest, resultado: Dict) -> Dict:
+        """
+        Record a new result and return what changed since the previous one.
+
+        The first result of a session is returned in full.
+        """
+        anterior = self.ultimo_resultado
+        self.ultimo_resultado = resultado
+        self.ultima_requisicao = request.model_dump()
+
+        if anterior is None:
+            return {'tipo': 'completo', 'data': resultado}
+
+        mensagem = {'tipo': 'delta'}
+
+        movimentos = _rank_moves(
+            anterior['dados_graficos']['todos_scores'],
+            resultado['dados_graficos']['todos_scores']
+        )
+        if movimentos:
+            mensagem['movimentos'] = movimentos
+
+        scores = _changed_scores(
+            anterior['dados_graficos']['todos_scores'],
+            resultado['dados_graficos']['todos_scores']
+        )
+        if scores:
+            mensagem['scores'] = scores
+
+        for campo in ('numeros_principais', 'pool_estendido', 'estatisticas',
+                      'modo_inferencia', 'modo_selecao'):
+            if resultado[campo] != anterior[campo]:
+                mensagem[campo] = resultado[campo]
+
+        for campo in ('distribuicao_scores', 'explicacao'):
+            valor = resultado['dados_graficos'].get(campo)
+            if valor != anterior['dados_graficos'].get(campo):
+                mensagem[campo] = valor
+
+        return mensagem
+
+
+def _rank_moves(anterior: List[Dict], atual: List[Dict]) -> List[Dict]:
+    """Numbers whose 1-based rank changed, with old and new rank."""
+    rank_anterior = {item['numero']: posicao for posicao, item in enumerate(anterior, 1)}
+
+    return [
+        {'numero': item['numero'], 'de': rank_anterior[item['numero']], 'para': posicao}
+        for posicao, item in enumerate(atual, 1)
+        if rank_anterior[item['numero']] != posicao
+    ]
+
+
+def _changed_scores(anterior: List[Dict], atual: List[Dict]) -> List[Dict]:
+    """Numbers whose score changed by more than TOLERANCIA_SCORE."""
+    score_anterior = {item['numero']: item['score'] for item in anterior}
+
+    return [
+        item
+        for item in atual
+        if abs(item['score'] - score_anterior[item['numero']]) > TOLERANCIA_SCORE
+    ]
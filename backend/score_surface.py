@@ -0,0 +1,207 @@
+"""
+Precomputed score surfaces over the weight space
+
+Tabulates the score of every number on a regular grid over the 5 weights
+(0-100 each) and answers requests by multilinear interpolation between the
+32 grid corners around the requested weights, instead of running inference.
+
+The Mamdani output is not smooth in the weights: it jumps when rules stop
+firing (down to 0 when none fires), so plain interpolation can be far off
+near those edges. Two safeguards keep the results honest:
+
+- Every grid cell is checked at its center against exact inference; numbers
+  whose cell misses the error budget there are always computed exactly.
+- The surface is validated on random weights after building. If the
+  measured maximum error still exceeds the budget, it is marked inactive
+  and callers fall back to exact inference.
+"""
+
+import itertools
+import logging
+import time
+import numpy as np
+from typing import Dict, List, Optional
+
+from fuzzy_batch import BatchMamdani
+
+logger = logging.getLogger(__name__)
+
+
+# Weight grid cells evaluated per inference batch
+CELULAS_POR_LOTE = 4096
+
+
+class ScoreSurface:
+    """
+    Per-number score table over a weight grid.
+
+    The table has shape ``(P,) * variables + (60,)`` in float32, where P is
+    the number of grid points per weight axis.
+    """
+
+    def __init__(self, inferencia: BatchMamdani, entradas: np.ndarray,
+                 pontos_grade: int = 7, orcamento_erro: float = 0.05,
+                 amostras_validacao: int = 500, seed: int = 0):
+        """
+        Build and validate the surface.
+
+        Args:
+            inferencia: Batched evaluator used for the table and for fallbacks
+            entradas: (60 x variables) fuzzy inputs at 100% weight
+            pontos_grade: Grid points per weight axis (>= 2)
+            orcamento_erro: Maximum accepted absolute score error
+            amostras_validacao: Random weight vectors used for validation
+            seed: Seed for the validation samples
+        """
+        if pontos_grade < 2:
+            raise ValueError("The weight grid needs at least 2 points per axis")
+
+        self.inferencia = inferencia
+        self.entradas = np.asarray(entradas, dtype=np.float64)
+        self.pontos_grade = pontos_grade
+        self.orcamento_erro = orcamento_erro
+        self.amostras_validacao = amostras_validacao
+
+        self.grade = np.linspace(0, 100, pontos_grade)
+        self._passo = self.grade[1] - self.grade[0]
+        self._dimensoes = self.entradas.shape[1]
+
+        inicio = time.perf_counter()
+        self.tabela = self._tabular(self.grade).astype(np.float32)
+        self.exatas = self._marcar_celulas()
+        self.tempo_construcao_s = time.perf_counter() - inicio
+
+        self.erro_interpolacao, self.erro_maximo = self._validar(seed)
+        self.ativa = self.erro_maximo <= orcamento_erro
+
+        logger.info(
+            f"Score surface: {pontos_grade} points/axis, {self.nbytes / 1024:.0f} KiB, "
+            f"built in {self.tempo_construcao_s:.1f} s, max error {self.erro_maximo:.4f} "
+            f"({'active' if self.ativa else 'inactive, using exact inference'})"
+        )
+
+    def _tabular(self, eixo: np.ndarray) -> np.ndarray:
+        """Exact scores at every point of the grid ``eixo ** variables``."""
+        pontos = np.stack(
+            np.meshgrid(*[eixo] * self._dimensoes, indexing='ij'), axis=-1
+        ).reshape(-1, self._dimensoes)
+
+        partes = []
+        for inicio in range(0, len(pontos), CELULAS_POR_LOTE):
+            pesos = pontos[inicio:inicio + CELULAS_POR_LOTE] / 100
+            entradas = self.entradas[None, :, :] * pesos[:, None, :]
+            partes.append(
+                self.inferencia.evaluate(entradas.reshape(-1, self._dimensoes))
+                .reshape(len(pesos), -1)
+            )
+
+        return np.concatenate(partes).reshape((len(eixo),) * self._dimensoes + (-1,))
+
+    def _marcar_celulas(self) -> np.ndarray:
+        """
+        Flag, per cell and number, where interpolation misses the budget.
+
+        At a cell center every corner has weight 1/32, so the interpolated
+        value is the mean of the corners.
+        """
+        p = self.pontos_grade
+        centros = self._tabular(self.grade[:-1] + self._passo / 2)
+
+        media = np.zeros_like(centros)
+        for canto in itertools.product((0, 1), repeat=self._dimensoes):
+            media += self.tabela[tuple(slice(c, p - 1 + c) for c in canto)]
+        media /= 2 ** self._dimensoes
+
+        return np.abs(media - centros) > self.orcamento_erro
+
+    def _localizar(self, pesos: np.ndarray):
+        """Lower corner index and fractional position of the cell holding ``pesos``."""
+        posicao = np.clip(pesos, 0, 100) / self._passo
+        indice = np.minimum(np.floor(posicao).astype(np.int64), self.pontos_grade - 2)
+        return indice, posicao - indice
+
+    def _interpolar(self, indice: np.ndarray, fracao: np.ndarray) -> np.ndarray:
+        """Multilinear interpolation of the 60 scores inside one cell."""
+        resultado = np.zeros(self.tabela.shape[-1])
+        for canto in itertools.product((0, 1), repeat=self._dimensoes):
+            canto = np.array(canto)
+            peso = np.prod(np.where(canto == 1, fracao, 1 - fracao))
+            if peso:
+                resultado += peso * self.tabela[tuple(indice + canto)]
+        return resultado
+
+    def _vetor_pesos(self, pesos: Optional[Dict[str, float]], variaveis: List[str]) -> np.ndarray:
+        pesos = pesos or {}
+        return np.array([pesos.get(v, 100) for v in variaveis], dtype=np.float64)
+
+    def scores(self, pesos: Optional[Dict[str, float]], variaveis: List[str]) -> np.ndarray:
+        """
+        Scores of all numbers (in input row order) for the given weights.
+
+        Numbers whose cell is flagged are computed with exact inference.
+
+        Args:
+            pesos: Weights for each variable (0-100); missing ones count as 100
+            variaveis: Variable names in input column order
+        """
+        vetor = self._vetor_pesos(pesos, variaveis)
+        indice, fracao = self._localizar(vetor)
+        resultado = self._interpolar(indice, fracao)
+
+        exatos = self.exatas[tuple(indice)]
+        if exatos.any():
+            resultado[exatos] = self.inferencia.evaluate(self.entradas[exatos] * (vetor / 100))
+
+        return resultado
+
+    def _validar(self, seed: int):
+        """
+        Compare against exact inference on random weights plus the grid center.
+
+        Returns:
+            (raw interpolation error, error with flagged cells computed exactly)
+        """
+        rng = np.random.default_rng(seed)
+        amostras = np.vstack([
+            np.full(self._dimensoes, 50.0),
+            rng.uniform(0, 100, (self.amostras_validacao, self._dimensoes))
+        ])
+
+        exatos = self.inferencia.evaluate(
+            (self.entradas[None, :, :] * (amostras[:, None, :] / 100)).reshape(-1, self._dimensoes)
+        ).reshape(len(amostras), -1)
+
+        erro_interpolacao = 0.0
+        erro_maximo = 0.0
+        for vetor, exato in zip(amostras, exatos):
+            indice, fracao = self._localizar(vetor)
+            erro = np.abs(self._interpolar(indice, fracao) - exato)
+            erro_interpolacao = max(erro_interpolacao, float(erro.max()))
+            erro[self.exatas[tuple(indice)]] = 0.0
+            erro_maximo = max(erro_maximo, float(erro.max()))
+
+        return erro_interpolacao, erro_maximo
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the score table and the per-cell flags."""
+        return int(self.tabela.nbytes + self.exatas.nbytes)
+
+    @property
+    def fracao_exata(self) -> float:
+        """Fraction of (cell, number) pairs always computed exactly."""
+        return float(self.exatas.mean())
+
+    def summary(self) -> Dict:
+        """Build parameters and validation results."""
+        return {
+            'ativa': bool(self.ativa),
+            'pontos_grade': self.pontos_grade,
+            'orcamento_erro': self.orcamento_erro,
+            'erro_maximo': self.erro_maximo,
+            'erro_interpolacao': self.erro_interpolacao,
+            'fracao_exata': self.fracao_exata,
+            'amostras_validacao': self.amostras_validacao,
+            'bytes': self.nbytes,
+            'tempo_construcao_s': self.tempo_construcao_s
+        }
@@ -0,0 +1,62 @@
+"""select_numbers against brute force on small instances."""
+
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from pool_optimizer import RestricoesInviaveis, select_numbers
+
+
+def _brute_force(numeros, scores, quantidade, pares_min, pares_max,
+                 dezenas_min, dezenas_max, soma_min, soma_max):
+    """Best total score over every feasible subset (None if there is none)."""
+    melhor = None
+    for indices in combinations(range(len(numeros)), quantidade):
+        escolhidos = [numeros[i] for i in indices]
+        pares = sum(n % 2 == 0 for n in escolhidos)
+        dezenas = np.bincount([(n - 1) // 10 for n in escolhidos], minlength=6)
+        if not (pares_min <= pares <= pares_max and soma_min <= sum(escolhidos) <= soma_max):
+            continue
+        if np.any(dezenas < dezenas_min) or np.any(dezenas > dezenas_max):
+            continue
+        total = sum(scores[i] for i in indices)
+        if melhor is None or total > melhor:
+            melhor = total
+    return melhor
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    numeros = sorted(rng.choice(np.arange(1, 61), size=14, replace=False).tolist())
+    scores = rng.uniform(0, 10, size=len(numeros))
+    quantidade = int(rng.integers(3, 7))
+    restricoes = {
+        'pares_min': int(rng.integers(0, 3)),
+        'pares_max': int(rng.integers(3, quantidade + 1)),
+        'dezenas_min': rng.integers(0, 2, size=6) * (rng.uniform(size=6) < 0.3),
+        'dezenas_max': rng.integers(1, 4, size=6),
+        'soma_min': int(rng.integers(0, 100)),
+        'soma_max': int(rng.integers(150, 300)),
+    }
+
+    esperado = _brute_force(numeros, scores, quantidade, **restricoes)
+    if esperado is None:
+        with pytest.raises(RestricoesInviaveis):
+            select_numbers(numeros, scores, quantidade, **restricoes)
+        return
+
+    escolhidos = select_numbers(numeros, scores, quantidade, **restricoes)
+    assert len(escolhidos) == quantidade
+    total = sum(scores[numeros.index(n)] for n in escolhidos)
+    assert total == pytest.approx(esperado, abs=1e-9)
+
+
+def test_infeasible_constraints_raise():
+    numeros = list(range(1, 61))
+    scores = np.linspace(10, 0, 60)
+
+    # Six even numbers summing to at most 30 do not exist (2 + 4 + ... + 12 = 42)
+    with pytest.raises(RestricoesInviaveis):
+        select_numbers(numeros, scores, 6, pares_min=6, soma_max=30)